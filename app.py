@@ -0,0 +1,48 @@
+import time
+
+import streamlit as st
+from moodmusic import ui
+from moodmusic.detection import detect_face_mood, detect_text_mood
+from moodmusic.warmup import start_warmup
+
+started = time.perf_counter()
+
+# ---------------------------------
+# 🎨 PAGE CONFIGURATION
+# ---------------------------------
+ui.page_setup("Tell me how you feel — or take a selfie — and I’ll find playlists to match your vibe 🎶")
+
+# ---------------------------------
+# 💬 USER INPUT
+# ---------------------------------
+user_text = st.text_input("📝 How are you feeling today?")
+
+camera = st.expander("📸 Or let your face do the talking", key="camera", on_change="rerun")
+img_file = None
+if camera.open:
+    # Build the DeepFace models in the background while the user takes a selfie
+    start_warmup()
+    with camera:
+        img_file = st.camera_input("Take a selfie")
+
+mood = None
+if img_file is not None:
+    with st.spinner("Analyzing your mood... 🧠"):
+        start_warmup().join()
+        try:
+            mood, _ = detect_face_mood(img_file.getbuffer())
+        except Exception as e:
+            st.warning(f"Could not analyze your selfie ({e}). Using your text instead.")
+
+if mood is None and user_text:
+    mood, _ = detect_text_mood(user_text)
+
+if mood:
+    ui.render_mood(mood)
+
+    # ---------------------------------
+    # 🎵 FETCH PLAYLISTS
+    # ---------------------------------
+    ui.render_for_mood(mood, started)
+
+ui.render_debug()
@@ -1,12 +1,22 @@
+import time
+
 import streamlit as st
-import spotipy
-from spotipy.oauth2 import SpotifyClientCredentials
-from textblob import TextBlob
+from moodmusic import ui
+from moodmusic.detection import detect_text_mood
+
+# Background colors & animation speed per mood
+MOOD_BACKGROUNDS = {
+    "Happy": (["#FFD54F", "#FF8A65", "#FFB300", "#F06292"], "12s"),
+    "Sad": (["#2196F3", "#3F51B5", "#1A237E", "#3949AB"], "20s"),
+    "Neutral": (["#CFD8DC", "#ECEFF1", "#B0BEC5", "#90A4AE"], "15s"),
+}
+
+started = time.perf_counter()
 
 # -----------------------------
 # PAGE CONFIGURATION
 # -----------------------------
-st.set_page_config(page_title="Mood Music Recommender", page_icon="🎵", layout="centered")
+ui.page_setup("Tell me how you feel — and I’ll match your vibe with Spotify playlists 🎶")
 
 # Function to set animated background
 def set_animated_bg(colors, speed="10s"):
@@ -34,34 +44,13 @@ def set_animated_bg(colors, speed="10s"):
     """
     st.markdown(gradient_css, unsafe_allow_html=True)
 
-# -----------------------------
-# APP HEADER
-# -----------------------------
-st.title("🎧 Mood-Based Music Recommender")
-st.markdown("Tell me how you feel — and I’ll match your vibe with Spotify playlists 🎶")
-
 user_text = st.text_input("📝 How are you feeling today?")
 
 if user_text:
-    blob = TextBlob(user_text)
-    polarity = blob.sentiment.polarity
-
-    # Define mood colors & animation
-    if polarity > 0.2:
-        mood = "Happy"
-        colors = ["#FFD54F", "#FF8A65", "#FFB300", "#F06292"]
-        speed = "12s"
-    elif polarity < -0.2:
-        mood = "Sad"
-        colors = ["#2196F3", "#3F51B5", "#1A237E", "#3949AB"]
-        speed = "20s"
-    else:
-        mood = "Neutral"
-        colors = ["#CFD8DC", "#ECEFF1", "#B0BEC5", "#90A4AE"]
-        speed = "15s"
+    mood, _ = detect_text_mood(user_text)
 
     # Apply background animation
-    set_animated_bg(colors, speed)
+    set_animated_bg(*MOOD_BACKGROUNDS[mood])
 
     st.markdown(
         f"""
@@ -73,51 +62,6 @@ if user_text:
     )
 
     # -----------------------------
-    # SPOTIFY AUTH
+    # SPOTIFY PLAYLISTS
     # -----------------------------
-    client_id, client_secret = None, None
-    try:
-        creds = st.secrets["spotify"]
-        client_id = creds.get("client_id")
-        client_secret = creds.get("client_secret")
-    except Exception:
-        st.warning("Spotify credentials not found. Enter manually:")
-        client_id = st.text_input("Spotify Client ID", type="password")
-        client_secret = st.text_input("Spotify Client Secret", type="password")
-
-    if not client_id or not client_secret:
-        st.stop()
-
-    sp = spotipy.Spotify(auth_manager=SpotifyClientCredentials(client_id=client_id, client_secret=client_secret))
-
-    mood_to_genre = {"Happy": "pop", "Sad": "acoustic", "Neutral": "chill"}
-    genre = mood_to_genre.get(mood, "chill")
-
-    st.info(f"🎧 Searching Spotify for '{genre}' playlists...")
-
-    playlists = sp.search(q=f"playlist {genre}", type="playlist", limit=3)
-
-    playlist_data = playlists.get("playlists", {}).get("items", [])
-    if not playlist_data:
-        st.warning("😕 No playlists found.")
-        st.stop()
-
-    for playlist in playlist_data:
-        st.subheader(f"🎶 {playlist.get('name', 'Unnamed Playlist')}")
-        if playlist.get("images"):
-            st.image(playlist["images"][0]["url"], width=300)
-
-        playlist_id = playlist.get("id")
-        tracks = sp.playlist_tracks(playlist_id, limit=3)
-        for item in tracks["items"]:
-            track = item.get("track", {})
-            name = track.get("name", "Unknown")
-            artists = ", ".join([a["name"] for a in track.get("artists", [])])
-            preview_url = track.get("preview_url")
-
-            st.markdown(f"**{name}** — {artists}")
-            if preview_url:
-                st.audio(preview_url, format="audio/mp3")
-            else:
-                st.caption("🔇 No preview available.")
-        st.write("---")
+    ui.render_for_mood(mood, started, image_width=300)
@@ -0,0 +1 @@
+"""Shared, process-wide helpers used by the Streamlit mood music apps."""
@@ -0,0 +1,146 @@
+"""Headless HTTP recommendation API.
+
+    POST /recommend {"text": "I'm feeling great today!"}
+    → {"mood": "Happy", "score": 0.8, "genre": "pop", "playlists": [...]}
+    GET  /artwork?url=<Spotify image URL>&w=280
+    → cached JPEG thumbnail (see ``moodmusic.artwork``)
+    GET  /preview?url=<Spotify preview URL>
+    → cached 30-second MP3 clip (see ``moodmusic.previews``)
+
+Runs the same TextBlob / genre / Spotify logic as the Streamlit apps.
+Blocking Spotify calls run in the server's thread pool, so one worker
+process serves many concurrent requests; the Spotify client, the
+in-memory caches and the models are shared by every request in a worker,
+and the SQLite catalog store is shared by all workers.
+
+    python -m moodmusic.api --workers 4 --port 8000
+
+Requests are served from the offline index (``moodmusic.index``) when
+one has been built; Spotify is then only used to refresh it. Without an
+index the live catalog is used, with credentials from
+``SPOTIPY_CLIENT_ID`` / ``SPOTIPY_CLIENT_SECRET``, and a throttled
+Spotify is answered with 503 and ``Retry-After``. Requests with
+``"ranking": "valence_energy"`` are always served from the index, ranking
+its tracks by distance to the text's valence/energy point
+(``moodmusic.scoring``) instead of by the mood's genre.
+"""
+
+import math
+from dataclasses import asdict
+
+from fastapi import FastAPI, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, Field
+
+from moodmusic import catalog, detection
+from moodmusic.artwork import get_artwork_cache
+from moodmusic.credentials import read_spotify_credentials
+from moodmusic.index import get_index
+from moodmusic.media import CACHE_CONTROL
+from moodmusic.previews import get_preview_cache, prefetch_previews
+from moodmusic.recommend import recommend, recommend_offline, recommend_point_offline
+from moodmusic.scheduler import throttled_for
+from moodmusic.scoring import text_point
+from moodmusic.spotify import get_spotify_client
+
+app = FastAPI(title="Mood Music Recommender")
+
+
+class RecommendRequest(BaseModel):
+    text: str = Field(min_length=1, max_length=2000)
+    engine: str = Field(default="textblob", pattern="^(textblob|transformers)$")
+    playlists: int = Field(default=3, ge=1, le=10)
+    tracks: int = Field(default=3, ge=1, le=10)
+    ranking: str = Field(default="genre", pattern="^(genre|valence_energy)$")
+
+
+def _recommend(request):
+    mood, score = detection.detect_text_mood(request.text, engine=request.engine)
+
+    if request.ranking == "valence_energy":
+        index = get_index()
+        if index is None:
+            raise HTTPException(503, "valence_energy ranking needs an offline index")
+        point = text_point(request.text)
+        result = recommend_point_offline(mood, point, index, request.playlists, request.tracks)
+        body = asdict(result)
+        body.update(score=score, valence=float(point[0]), energy=float(point[1]))
+        return body
+
+    index = get_index()
+    client_id, client_secret = read_spotify_credentials()
+    if index is not None:
+        result = recommend_offline(mood, index, request.playlists, request.tracks)
+    elif client_id and client_secret:
+        sp = get_spotify_client(client_id, client_secret)
+        try:
+            result = recommend(sp, mood, request.playlists, request.tracks)
+        except Exception as e:
+            retry_after = throttled_for(e)
+            if retry_after is None:
+                raise
+            raise HTTPException(503, "Spotify is rate limiting requests",
+                                headers={"Retry-After": str(math.ceil(retry_after))})
+        prefetch_previews(result.playlists)
+    else:
+        raise HTTPException(503, "No Spotify credentials configured and no offline index built")
+
+    body = asdict(result)
+    body["score"] = score
+    return body
+
+
+@app.post("/recommend")
+async def recommend_endpoint(request: RecommendRequest):
+    return await run_in_threadpool(_recommend, request)
+
+
+@app.get("/artwork")
+async def artwork(url: str, w: int = Query(default=300)):
+    try:
+        data = await run_in_threadpool(get_artwork_cache().thumbnail, url, w)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception:
+        raise HTTPException(502, "Could not fetch artwork")
+    return Response(data, media_type="image/jpeg", headers={"Cache-Control": CACHE_CONTROL})
+
+
+@app.get("/preview")
+async def preview(url: str):
+    try:
+        data = await run_in_threadpool(get_preview_cache().fetch, url)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    except Exception:
+        raise HTTPException(502, "Could not fetch preview")
+    return Response(data, media_type="audio/mpeg", headers={"Cache-Control": CACHE_CONTROL})
+
+
+@app.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@app.get("/stats")
+async def stats():
+    return {
+        "catalog": catalog.cache_stats(),
+        "detection": detection.cache_stats(),
+        "artwork": get_artwork_cache().stats(),
+        "previews": get_preview_cache().stats(),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve the recommendation API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    uvicorn.run("moodmusic.api:app", host=args.host, port=args.port, workers=args.workers)
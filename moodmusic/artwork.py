@@ -0,0 +1,181 @@
+"""Local proxy and thumbnail cache for playlist artwork.
+
+``st.image(url, width=280)`` made every browser download full-size
+artwork from Spotify's CDN on every rerun. ``ArtworkCache`` fetches each
+image once, keeps the original and one JPEG thumbnail per UI width on
+disk, and evicts the least recently used files once the directory grows
+past ``max_bytes``.
+
+The Streamlit apps resolve artwork with ``artwork_src(url, width)``:
+
+* with ``MOODMUSIC_ARTWORK_PROXY`` set (e.g. ``http://127.0.0.1:8000/artwork``,
+  the route served by ``moodmusic.api``) the browser is pointed at the
+  proxy, which answers with long-lived ``Cache-Control`` headers;
+* otherwise cached thumbnail bytes are handed to ``st.image``. A miss
+  never blocks the page: the Spotify URL is used for that render while a
+  small background pool fills the cache for the next one.
+
+Either way the original Spotify URL is used if the artwork cannot be
+fetched. Only Spotify CDN hosts are proxied (see ``moodmusic.media``).
+"""
+
+import concurrent.futures
+import io
+import logging
+import os
+import threading
+from urllib.parse import urlencode
+
+from moodmusic.cache import TTLCache
+from moodmusic.media import DiskLRU, download, is_spotify_cdn, url_key
+from moodmusic.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.environ.get(
+    "MOODMUSIC_ARTWORK_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "moodmusic", "artwork"),
+)
+MAX_BYTES = int(float(os.environ.get("MOODMUSIC_ARTWORK_MAX_MB", "200")) * 1024 * 1024)
+PROXY_URL = os.environ.get("MOODMUSIC_ARTWORK_PROXY")
+
+# The widths the apps render artwork at.
+WIDTHS = (250, 280, 300)
+FETCH_TIMEOUT = 5.0
+BACKGROUND_WORKERS = 2
+MAX_ORIGINAL_BYTES = 10 * 1024 * 1024
+JPEG_QUALITY = 85
+
+
+def resize(data, width):
+    """Scale image bytes down to ``width`` pixels wide and return JPEG bytes."""
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        image = image.convert("RGB")
+        if image.width > width:
+            height = max(1, round(image.height * width / image.width))
+            image = image.resize((width, height), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, format="JPEG", quality=JPEG_QUALITY, optimize=True)
+    return out.getvalue()
+
+
+class ArtworkCache:
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=MAX_BYTES, timeout=FETCH_TIMEOUT,
+                 workers=BACKGROUND_WORKERS):
+        self.files = DiskLRU(directory, max_bytes)
+        self.timeout = timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="artwork-fill"
+        )
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._session = None
+        self.hits = 0
+        self.misses = 0
+        self.fetches = 0
+
+    def _original(self, url, digest):
+        import requests
+
+        name = f"{digest}.orig"
+        data = self.files.get(name)
+        if data is None:
+            if self._session is None:
+                self._session = requests.Session()
+            data = download(self._session, url, self.timeout, MAX_ORIGINAL_BYTES, "image/")
+            with self._lock:
+                self.fetches += 1
+            self.files.put(name, data)
+        return data
+
+    def get(self, url, width):
+        """Cached thumbnail bytes for ``url`` at ``width``, or ``None``; never downloads."""
+        data = self.files.get(f"{url_key(url)}-{width}.jpg")
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return data
+
+    def thumbnail(self, url, width):
+        """JPEG bytes of ``url`` scaled to ``width``; fetches the original at most once."""
+        if width not in WIDTHS:
+            raise ValueError(f"Unsupported artwork width {width}; expected one of {WIDTHS}")
+        if not is_spotify_cdn(url):
+            raise ValueError(f"Not a Spotify image URL: {url}")
+
+        data = self.get(url, width)
+        if data is not None:
+            return data
+        return self._load(url, width)
+
+    def _load(self, url, width):
+        digest = url_key(url)
+
+        def load():
+            data = resize(self._original(url, digest), width)
+            self.files.put(f"{digest}-{width}.jpg", data)
+            return data
+
+        return self._flights.do((url, width), load)
+
+    def _fill(self, url, width):
+        try:
+            self._load(url, width)
+        except Exception as e:
+            logger.info("Could not cache artwork %s: %s", url, e)
+            _failures.set(url, True)
+        finally:
+            with self._lock:
+                self._pending.discard((url, width))
+
+    def fill_in_background(self, url, width):
+        """Queue ``thumbnail(url, width)`` on the background pool unless already queued."""
+        with self._lock:
+            if (url, width) in self._pending:
+                return
+            self._pending.add((url, width))
+        self._executor.submit(self._fill, url, width)
+
+    def stats(self):
+        stats = self.files.stats()
+        with self._lock:
+            stats.update(
+                hits=self.hits, misses=self.misses, fetches=self.fetches, pending=len(self._pending)
+            )
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# URLs that could not be fetched recently; they are not retried in the
+# background on every rerun.
+_failures = TTLCache(maxsize=1024, ttl=5 * 60)
+
+
+def get_artwork_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ArtworkCache()
+        return _cache
+
+
+def artwork_src(url, width):
+    """What to hand ``st.image`` for ``url`` at ``width``: a proxy URL, thumbnail bytes or ``url``."""
+    if not url or width not in WIDTHS or not is_spotify_cdn(url):
+        return url
+    if PROXY_URL:
+        return f"{PROXY_URL}?{urlencode({'url': url, 'w': width})}"
+    cache = get_artwork_cache()
+    data = cache.get(url, width)
+    if data is not None:
+        return data
+    if not _failures.get(url):
+        cache.fill_in_background(url, width)
+    return url
@@ -0,0 +1,132 @@
+"""Dynamic micro-batching for model inference.
+
+Concurrent sessions each submit a single input. A background worker
+gathers whatever is queued, up to ``max_batch_size`` items or
+``max_wait_ms`` after the first one arrived, runs the model once on the
+whole batch and resolves each caller's future with its own result.
+
+Compare against one-at-a-time inference with::
+
+    python -m moodmusic.batching --requests 512 --concurrency 32
+"""
+
+import collections
+import concurrent.futures
+import queue
+import threading
+import time
+
+
+class MicroBatcher:
+    def __init__(self, batch_fn, max_batch_size=16, max_wait_ms=5.0, name="micro-batcher"):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._batch_sizes = collections.Counter()
+        self.requests = 0
+        self.batches = 0
+        self._worker = threading.Thread(target=self._run, name=name, daemon=True)
+        self._worker.start()
+
+    def submit(self, item):
+        future = concurrent.futures.Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item, timeout=None):
+        return self.submit(item).result(timeout=timeout)
+
+    def _next_batch(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait_ms / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            live = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+            if not live:
+                continue
+            items = [item for item, _ in live]
+            futures = [future for _, future in live]
+
+            with self._lock:
+                self.requests += len(items)
+                self.batches += 1
+                self._batch_sizes[len(items)] += 1
+
+            try:
+                results = list(self.batch_fn(items))
+                if len(results) != len(futures):
+                    raise ValueError(
+                        f"batch_fn returned {len(results)} results for {len(futures)} items"
+                    )
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            for future, result in zip(futures, results):
+                future.set_result(result)
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "requests": self.requests,
+                "batches": self.batches,
+                "mean_batch_size": self.requests / self.batches if self.batches else 0.0,
+                "batch_sizes": dict(sorted(self._batch_sizes.items())),
+            }
+
+
+def _bench(fn, texts, concurrency):
+    with concurrent.futures.ThreadPoolExecutor(max_workers=concurrency) as pool:
+        start = time.perf_counter()
+        list(pool.map(fn, texts))
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from moodmusic.models import get_sentiment_pipeline
+
+    parser = argparse.ArgumentParser(description="Benchmark micro-batched sentiment inference.")
+    parser.add_argument("--requests", type=int, default=512)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    samples = [
+        "I'm feeling great today!",
+        "I'm really tired and a bit down...",
+        "Nothing special, just another day.",
+        "This is the worst week ever.",
+    ]
+    texts = [f"{samples[i % len(samples)]} ({i})" for i in range(args.requests)]
+    pipe = get_sentiment_pipeline()
+    pipe(samples)  # load and warm up before timing
+
+    single = _bench(lambda text: pipe(text)[0], texts, args.concurrency)
+    batcher = MicroBatcher(
+        lambda batch: pipe(batch, batch_size=len(batch)),
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+    )
+    batched = _bench(batcher, texts, args.concurrency)
+
+    print(f"one-at-a-time: {single:.2f}s ({args.requests / single:,.1f} req/s)")
+    print(f"micro-batched: {batched:.2f}s ({args.requests / batched:,.1f} req/s)")
+    print(f"speedup: {single / batched:.2f}x")
+    print(f"batcher metrics: {batcher.metrics()}")
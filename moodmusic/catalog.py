@@ -0,0 +1,194 @@
+"""Spotify catalog lookups shared by the app variants."""
+
+import concurrent.futures
+import logging
+import time
+
+import spotipy
+
+from moodmusic.cache import TTLCache
+from moodmusic.scheduler import INTERACTIVE, INTERACTIVE_TIMEOUT, current_priority, get_scheduler
+from moodmusic.singleflight import SingleFlight
+from moodmusic.store import get_store
+
+logger = logging.getLogger(__name__)
+
+MAX_WORKERS = 8
+# Same budget as the scheduler gives each interactive call, so a fetch the
+# page has given up on is not left running behind it.
+FETCH_TIMEOUT = INTERACTIVE_TIMEOUT
+# Stale store entries are being refreshed in the background; keep them in
+# memory only briefly so the refreshed row is picked up soon after.
+STALE_TTL = 30.0
+SPOTIFY_API = "https://api.spotify.com/v1/"
+
+# The genre comes from a handful of fixed moods, so the same few searches
+# and playlist_tracks calls repeat for every user. Both are shared across
+# sessions; tune ``ttl``/``maxsize`` on these instances as needed.
+search_cache = TTLCache(maxsize=128, ttl=30 * 60)
+tracks_cache = TTLCache(maxsize=1024, ttl=30 * 60)
+
+# Sessions that miss the caches for the same key at the same time share
+# one store read / API call instead of each making their own.
+flights = SingleFlight()
+
+_executor = concurrent.futures.ThreadPoolExecutor(
+    max_workers=MAX_WORKERS, thread_name_prefix="playlist-tracks"
+)
+
+
+def api_scope(sp):
+    """Prefix for the cache keys of ``sp``'s responses.
+
+    Empty for Spotify itself and the base URL for a stand-in (see
+    ``MOODMUSIC_SPOTIFY_API``), so fixture responses are never stored as,
+    or served in place of, real catalog data.
+    """
+    prefix = getattr(sp, "prefix", SPOTIFY_API)
+    return "" if prefix == SPOTIFY_API else f"{prefix}|"
+
+
+def _call(key, fn):
+    # A page waiting on this call gives up after INTERACTIVE_TIMEOUT
+    # instead of sitting out a long Retry-After; background work waits.
+    timeout = INTERACTIVE_TIMEOUT if current_priority() == INTERACTIVE else None
+    return get_scheduler().call(key, fn, timeout=timeout)
+
+
+# The API calls themselves also go through ``flights`` so a background
+# store refresh (which calls these directly) and an interactive miss for
+# the same key share one request.
+def _search(sp, genre, limit):
+    key = ("api", api_scope(sp), "search", genre, limit)
+    return flights.do(key, lambda: _call(
+        key, lambda: sp.search(q=f"playlist {genre}", type="playlist", limit=limit)
+    ))
+
+
+def _playlist_tracks(sp, playlist_id, limit):
+    key = ("api", api_scope(sp), "playlist_tracks", playlist_id, limit)
+    return flights.do(key, lambda: _call(
+        key, lambda: sp.playlist_tracks(playlist_id, limit=limit)
+    ))
+
+
+def _read_through(cache, cache_key, flight_key, kind, store_key, loader):
+    # Memory, then the on-disk store; concurrent misses share one store read.
+    payload = cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    def load():
+        payload, stale = get_store().read_through(kind, store_key, loader)
+        if payload is not None:
+            cache.set(cache_key, payload, ttl=STALE_TTL if stale else None)
+        return payload
+
+    return flights.do(flight_key, load)
+
+
+def search_playlists(sp, genre, limit=5):
+    """Cached ``sp.search`` for playlists matching ``genre``."""
+    scope = api_scope(sp)
+    return _read_through(
+        search_cache, (scope, genre, limit), ("search", scope, genre, limit),
+        "search", f"{scope}{genre}|{limit}", lambda: _search(sp, genre, limit),
+    )
+
+
+def get_playlist_tracks(sp, playlist_id, limit=3):
+    """Cached ``sp.playlist_tracks``."""
+    scope = api_scope(sp)
+    return _read_through(
+        tracks_cache, (scope, playlist_id, limit), ("playlist_tracks", scope, playlist_id, limit),
+        "tracks", f"{scope}{playlist_id}|{limit}", lambda: _playlist_tracks(sp, playlist_id, limit),
+    )
+
+
+def cache_stats():
+    return {
+        "search": search_cache.stats(),
+        "playlist_tracks": tracks_cache.stats(),
+        "single_flight": flights.stats(),
+        "scheduler": get_scheduler().metrics(),
+    }
+
+
+def iter_playlist_tracks(sp, playlists, limit=3, timeout=FETCH_TIMEOUT):
+    """Fetch playlist tracks concurrently, yielding ``(index, response)`` as each finishes.
+
+    Every playlist is yielded exactly once, in completion order. ``response``
+    is ``None`` when the playlist has no id, the request failed, or it ran
+    for more than ``timeout`` seconds (a 429 counts as failed). Playlists
+    still queued or running ``2 * timeout`` seconds after the call are
+    given up on as well, so a stalled API cannot hold the page longer.
+    Other ``SpotifyException`` errors (bad credentials, unknown playlist,
+    ...) are raised to the caller.
+    """
+    futures = {}
+    missing = []
+    started = {}
+
+    def fetch(i, playlist_id):
+        started[i] = time.monotonic()
+        return get_playlist_tracks(sp, playlist_id, limit)
+
+    # Each fetch gets ``timeout`` seconds from when a worker starts it, so
+    # a short wait behind other fetches does not count against it. The
+    # shared pool can be full of stalled fetches, though, so nothing waits
+    # more than ``2 * timeout`` from submission; cancelling frees the
+    # queued ones (running calls cannot be interrupted).
+    cap = time.monotonic() + 2 * timeout
+    for i, playlist in enumerate(playlists):
+        playlist_id = (playlist or {}).get("id")
+        if playlist_id:
+            futures[_executor.submit(fetch, i, playlist_id)] = i
+        else:
+            missing.append(i)
+
+    for i in missing:
+        yield i, None
+
+    pending = set(futures)
+    while pending:
+        for future in [f for f in pending if f.done()]:
+            pending.discard(future)
+            yield futures[future], _result(future)
+
+        now = time.monotonic()
+        deadlines = {}
+        for future in list(pending):
+            if future.done():
+                # Finished since the check above; yielded next round.
+                deadlines[future] = now
+                continue
+            start = started.get(futures[future])
+            deadline = cap if start is None else min(cap, start + timeout)
+            if now >= deadline:
+                pending.discard(future)
+                future.cancel()
+                logger.info("Timed out fetching tracks of playlist #%d", futures[future])
+                yield futures[future], None
+            else:
+                deadlines[future] = deadline
+        if not pending:
+            break
+
+        wait = min(deadlines.values()) - now
+        concurrent.futures.wait(
+            pending, timeout=max(0.0, wait), return_when=concurrent.futures.FIRST_COMPLETED
+        )
+
+
+def _result(future):
+    try:
+        return future.result()
+    except spotipy.SpotifyException as e:
+        if e.http_status == 429:
+            logger.info("Rate limited fetching playlist tracks: %s", e)
+            return None
+        raise
+    except Exception:
+        logger.exception("Fetching playlist tracks failed")
+        return None
+
@@ -0,0 +1,21 @@
+"""Spotify credential lookup that does not depend on Streamlit."""
+
+import os
+
+
+def read_spotify_credentials(secrets=None):
+    """Return ``(client_id, client_secret)`` from a secrets mapping or the environment.
+
+    ``secrets`` is anything with a ``"spotify"`` section, such as
+    ``st.secrets``. Falls back to spotipy's ``SPOTIPY_CLIENT_ID`` /
+    ``SPOTIPY_CLIENT_SECRET`` variables. Missing values come back as ``None``.
+    """
+    client_id = client_secret = None
+    if secrets is not None:
+        creds = secrets.get("spotify", None)
+        if creds and hasattr(creds, "get"):
+            client_id = creds.get("client_id")
+            client_secret = creds.get("client_secret")
+    client_id = client_id or os.environ.get("SPOTIPY_CLIENT_ID")
+    client_secret = client_secret or os.environ.get("SPOTIPY_CLIENT_SECRET")
+    return client_id, client_secret
@@ -0,0 +1,129 @@
+"""Memoized mood detectors.
+
+Streamlit reruns the whole script on every widget interaction, so the
+same text or selfie is scored again and again. Results are cached per
+normalized text (or per content hash for images) in one bounded,
+process-wide cache; hits skip inference entirely.
+
+Near-duplicate selfies (retakes) are only matched within the Streamlit
+session that took them: one visitor's result must never answer another
+visitor's similar-looking photo.
+"""
+
+import hashlib
+import re
+import sys
+import unicodedata
+
+from moodmusic.cache import TTLCache
+from moodmusic.moods import mood_from_polarity
+from moodmusic.phash import PerceptualCache
+
+mood_cache = TTLCache(maxsize=4096, ttl=60 * 60)
+# Session id → PerceptualCache of that session's selfies; near-duplicate
+# retakes resolve there when the exact bytes differ.
+face_caches = TTLCache(maxsize=256, ttl=60 * 60)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    # Cache key only: the scorers always see the user's own text. Case is
+    # kept because TextBlob's emoticons (":D" vs ":d") are case-sensitive.
+    text = unicodedata.normalize("NFC", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def image_digest(buffer):
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+
+def _session_id():
+    # Not worth importing Streamlit in the API or the CLI tools just to
+    # find there is no session.
+    if "streamlit" not in sys.modules:
+        return None
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else None
+
+
+def session_face_cache():
+    """The current Streamlit session's near-duplicate selfie cache, or ``None`` outside one."""
+    session_id = _session_id()
+    if session_id is None:
+        return None
+    return face_caches.get_or_load(
+        session_id, lambda: PerceptualCache(max_entries=32, max_distance=6)
+    )
+
+
+def _memoize(kind, key, compute):
+    return mood_cache.get_or_load((kind, key), compute)
+
+
+def text_polarity(text):
+    """TextBlob polarity of ``text``."""
+    def compute():
+        from textblob import TextBlob
+
+        return TextBlob(text).sentiment.polarity
+
+    return _memoize("textblob", normalize_text(text), compute)
+
+
+def text_sentiment(text):
+    """Transformers sentiment ``{"label", "score"}`` of ``text``."""
+    from moodmusic.models import get_sentiment_batcher
+
+    return _memoize("transformers", normalize_text(text), lambda: get_sentiment_batcher()(text))
+
+
+def face_emotion(buffer):
+    """DeepFace emotion analysis of an encoded camera capture."""
+
+    def compute():
+        from moodmusic.images import decode_image_buffer
+        from moodmusic.phash import dhash
+        from moodmusic.preprocess import analyze_emotion, preprocess
+
+        frame = preprocess(decode_image_buffer(buffer))
+        face_cache = session_face_cache()
+        if face_cache is None:
+            return analyze_emotion(frame)
+        image_hash = dhash(frame.gray)
+        result = face_cache.lookup(image_hash)
+        if result is None:
+            result = analyze_emotion(frame)
+            face_cache.add(image_hash, result)
+        return result
+
+    return _memoize("deepface", image_digest(buffer), compute)
+
+
+def detect_text_mood(text, engine="textblob"):
+    """Return ``(mood, score)`` for ``text``.
+
+    ``engine="textblob"`` scores polarity in [-1, 1]; ``"transformers"``
+    returns the sentiment model's confidence.
+    """
+    if engine == "transformers":
+        from moodmusic.models import label_to_mood
+
+        result = text_sentiment(text)
+        return label_to_mood(result["label"]), result["score"]
+
+    polarity = text_polarity(text)
+    return mood_from_polarity(polarity), polarity
+
+
+def detect_face_mood(buffer):
+    """Return ``(mood, confidence)`` for an encoded camera capture."""
+    result = face_emotion(buffer)[0]
+    emotion = result["dominant_emotion"]
+    return emotion.capitalize(), result["emotion"][emotion]
+
+
+def cache_stats():
+    return {"mood": mood_cache.stats(), "face_sessions": face_caches.stats()}
@@ -0,0 +1,221 @@
+"""Pluggable face detector backends for selfie preprocessing.
+
+Backends are CPU-only and ordered from most accurate to fastest. Pick one
+with ``MOODMUSIC_FACE_DETECTOR`` (default ``yunet``, OpenCV's small face
+CNN). With automatic fallback enabled, a backend that fails or whose
+moving-average latency exceeds ``MOODMUSIC_FACE_LATENCY_MS`` is swapped
+for the next faster one, ending at ``opencv``, an in-process Haar cascade.
+The first call on each backend builds its model and is left out of the
+average, and the configured backend is tried again ``MOODMUSIC_FACE_RETRY_S``
+seconds after it was swapped out.
+
+Rank the backends on a folder of face images with::
+
+    python -m moodmusic.detectors [path/to/faces/]
+
+(``fixtures/faces`` by default).
+"""
+
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Most accurate first; automatic fallback moves right along this list.
+BACKENDS = ("retinaface", "mtcnn", "ssd", "yunet", "opencv")
+TIERS = {
+    "retinaface": "accurate",
+    "mtcnn": "accurate",
+    "ssd": "balanced",
+    "yunet": "balanced",
+    "opencv": "fast",
+}
+
+DEFAULT_BACKEND = os.environ.get("MOODMUSIC_FACE_DETECTOR", "yunet")
+DEFAULT_LATENCY_MS = float(os.environ.get("MOODMUSIC_FACE_LATENCY_MS", "250"))
+DEFAULT_RETRY_S = float(os.environ.get("MOODMUSIC_FACE_RETRY_S", "600"))
+
+_cascade = None
+_cascade_lock = threading.Lock()
+
+
+def _face_cascade():
+    global _cascade
+    with _cascade_lock:
+        if _cascade is None:
+            import cv2
+
+            _cascade = cv2.CascadeClassifier(
+                cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+            )
+        return _cascade
+
+
+def _largest(boxes):
+    if not boxes:
+        return None
+    x, y, w, h = max(boxes, key=lambda box: box[2] * box[3])
+    return int(x), int(y), int(w), int(h)
+
+
+def _detect_haar(image, gray):
+    faces = _face_cascade().detectMultiScale(gray, scaleFactor=1.1, minNeighbors=5, minSize=(48, 48))
+    return _largest(list(faces))
+
+
+def _detect_deepface(backend, image):
+    from deepface import DeepFace
+
+    faces = DeepFace.extract_faces(
+        img_path=image, detector_backend=backend, enforce_detection=False, align=False
+    )
+    # With enforce_detection=False DeepFace returns the whole frame with
+    # zero confidence when nothing was found.
+    boxes = [
+        (area["x"], area["y"], area["w"], area["h"])
+        for area in (face["facial_area"] for face in faces if face.get("confidence", 0) > 0)
+    ]
+    return _largest(boxes)
+
+
+def detect_face(backend, image, gray):
+    """Return the largest face as ``(x, y, w, h)`` using ``backend``, or ``None``."""
+    if backend == "opencv":
+        return _detect_haar(image, gray)
+    return _detect_deepface(backend, image)
+
+
+class FaceDetector:
+    def __init__(self, backend=DEFAULT_BACKEND, latency_budget_ms=DEFAULT_LATENCY_MS,
+                 auto_fallback=True, smoothing=0.2, retry_after_s=DEFAULT_RETRY_S):
+        if backend not in TIERS:
+            raise ValueError(f"Unknown face detector backend '{backend}' (choose from {BACKENDS})")
+        self.preferred = self.backend = backend
+        self.latency_budget_ms = latency_budget_ms
+        self.auto_fallback = auto_fallback
+        self.smoothing = smoothing
+        self.retry_after_s = retry_after_s
+        self.latency_ms = {}
+        self._samples = {}
+        self._demoted_at = None
+        self._lock = threading.Lock()
+
+    def _current(self):
+        with self._lock:
+            if (self._demoted_at is not None
+                    and time.monotonic() - self._demoted_at >= self.retry_after_s):
+                logger.info("Retrying face detector %s", self.preferred)
+                self.backend = self.preferred
+                self._demoted_at = None
+                self.latency_ms.pop(self.preferred, None)
+            return self.backend
+
+    def detect(self, image, gray):
+        while True:
+            backend = self._current()
+            start = time.perf_counter()
+            try:
+                box = detect_face(backend, image, gray)
+            except Exception as e:
+                # E.g. missing weights or an OpenCV build without the model.
+                if not self._fall_back(backend, f"failed ({e})"):
+                    raise
+                continue
+            self._record(backend, (time.perf_counter() - start) * 1000)
+            return box
+
+    def _fall_back(self, backend, reason):
+        """Move on from ``backend`` to the next faster one; False if there is none."""
+        with self._lock:
+            if backend != self.backend:
+                return True  # another thread already moved on
+            position = BACKENDS.index(backend)
+            if not self.auto_fallback or position + 1 >= len(BACKENDS):
+                return False
+            self.backend = fallback = BACKENDS[position + 1]
+            if self._demoted_at is None:
+                self._demoted_at = time.monotonic()
+        logger.warning("Face detector %s %s; falling back to %s", backend, reason, fallback)
+        return True
+
+    def _record(self, backend, elapsed_ms):
+        with self._lock:
+            self._samples[backend] = samples = self._samples.get(backend, 0) + 1
+            if samples == 1:
+                return  # cold call: includes building the model
+            previous = self.latency_ms.get(backend)
+            average = elapsed_ms if previous is None else (
+                self.smoothing * elapsed_ms + (1 - self.smoothing) * previous
+            )
+            self.latency_ms[backend] = average
+        if average > self.latency_budget_ms:
+            self._fall_back(
+                backend, f"averages {average:.0f} ms (budget {self.latency_budget_ms:.0f} ms)"
+            )
+
+
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def get_face_detector():
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = FaceDetector()
+        return _detector
+
+
+def _iou(a, b):
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    overlap_w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    overlap_h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    overlap = overlap_w * overlap_h
+    union = aw * ah + bw * bh - overlap
+    return overlap / union if union else 0.0
+
+
+if __name__ == "__main__":
+    import argparse
+    import statistics
+
+    import cv2
+
+    from moodmusic.preprocess import DEFAULT_FACES, downscale, face_image_paths
+
+    parser = argparse.ArgumentParser(description="Rank face detector backends on local images.")
+    parser.add_argument("faces", nargs="?", default=DEFAULT_FACES,
+                        help="directory of face images (.jpg/.png)")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--reference", default="retinaface", help="backend whose boxes count as ground truth")
+    args = parser.parse_args()
+
+    paths = face_image_paths(parser, args.faces)
+    images = [downscale(cv2.imread(path)) for path in paths]
+    grays = [cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) for image in images]
+
+    results = {}
+    for backend in dict.fromkeys([args.reference] + args.backends):
+        try:
+            detect_face(backend, images[0], grays[0])  # build the model untimed
+        except Exception as e:
+            print(f"{backend}: unavailable ({e})")
+            continue
+        times, boxes = [], []
+        for image, gray in zip(images, grays):
+            start = time.perf_counter()
+            boxes.append(detect_face(backend, image, gray))
+            times.append((time.perf_counter() - start) * 1000)
+        results[backend] = (statistics.median(times), boxes)
+
+    reference = results.get(args.reference, (None, [None] * len(paths)))[1]
+    print(f"{len(paths)} images; agreement = mean IoU with {args.reference} boxes")
+    for backend, (median_ms, boxes) in sorted(results.items(), key=lambda item: item[1][0]):
+        found = sum(box is not None for box in boxes)
+        pairs = [(a, b) for a, b in zip(boxes, reference) if a and b]
+        agreement = statistics.mean(_iou(a, b) for a, b in pairs) if pairs else 0.0
+        print(f"{backend:<11} {TIERS.get(backend, '?'):<9} {median_ms:8.1f} ms  "
+              f"found {found}/{len(paths)}  IoU {agreement:.2f}")
@@ -0,0 +1,164 @@
+"""Local Spotify Web API stand-in for offline load tests.
+
+Replays a recorded catalog snapshot (``fixtures/catalog.json`` by default)
+for the endpoints the apps and the index ingestion use:
+
+    POST /api/token                    client-credentials token
+    GET  /v1/search?q=playlist <genre> playlist search
+    GET  /v1/playlists/<id>/tracks     playlist tracks (``/items`` on newer spotipy)
+    GET  /v1/audio-features?ids=...    valence/energy audio features
+
+Each request waits ``latency_ms`` ± ``jitter_ms`` and a ``rate_429``
+fraction of API calls are answered with 429 and a ``Retry-After`` header.
+
+    python -m moodmusic.fake_spotify --port 8999 --latency-ms 80 --rate-429 0.02
+    MOODMUSIC_SPOTIFY_API=http://127.0.0.1:8999 streamlit run app.py
+
+The catalog caches and store key responses by API base, so replayed
+fixtures never stand in for real Spotify data.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_FIXTURE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "fixtures", "catalog.json")
+
+
+class FakeSpotify:
+    def __init__(self, fixture=DEFAULT_FIXTURE, latency_ms=50.0, jitter_ms=10.0,
+                 rate_429=0.0, retry_after=1, seed=None):
+        with open(fixture, encoding="utf-8") as f:
+            self.catalog = json.load(f)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.server = None
+
+    def _delay(self):
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def _throttle(self):
+        with self._lock:
+            self.requests += 1
+            throttled = self._random.random() < self.rate_429
+            self.throttled += throttled
+            return throttled
+
+    def search(self, query):
+        genre = query.get("q", [""])[0].split()[-1] if query.get("q") else ""
+        limit = int(query.get("limit", ["10"])[0])
+        result = self.catalog["searches"].get(genre) or {"playlists": {"items": [], "total": 0}}
+        items = result["playlists"]["items"][:limit]
+        return {"playlists": dict(result["playlists"], items=items)}
+
+    def playlist_tracks(self, playlist_id, query):
+        tracks = self.catalog["tracks"].get(playlist_id)
+        if tracks is None:
+            return None
+        limit = int(query.get("limit", ["100"])[0])
+        return dict(tracks, items=tracks["items"][:limit])
+
+    def audio_features(self, query):
+        ids = query.get("ids", [""])[0].split(",")
+        features = self.catalog.get("features", {})
+        return {"audio_features": [
+            dict(features[track_id], id=track_id) if track_id in features else None
+            for track_id in ids
+        ]}
+
+    def start(self, host="127.0.0.1", port=0):
+        """Serve in a background thread; returns the base URL."""
+        self.server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, name="fake-spotify", daemon=True).start()
+        return f"http://{host}:{self.server.server_address[1]}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+def _handler_for(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status, body, headers=None):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            if urlparse(self.path).path != "/api/token":
+                self._send(404, {"error": {"status": 404, "message": "Not found"}})
+                return
+            self._send(200, {"access_token": "fake-token", "token_type": "Bearer", "expires_in": 3600})
+
+        def do_GET(self):
+            fake._delay()
+            if fake._throttle():
+                self._send(429, {"error": {"status": 429, "message": "API rate limit exceeded"}},
+                           {"Retry-After": str(fake.retry_after)})
+                return
+
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            parts = url.path.strip("/").split("/")
+            if parts == ["v1", "search"]:
+                self._send(200, fake.search(query))
+            elif parts == ["v1", "audio-features"]:
+                self._send(200, fake.audio_features(query))
+            elif len(parts) == 4 and parts[:2] == ["v1", "playlists"] and parts[3] in ("tracks", "items"):
+                tracks = fake.playlist_tracks(parts[2], query)
+                if tracks is None:
+                    self._send(404, {"error": {"status": 404, "message": "Invalid playlist Id"}})
+                else:
+                    self._send(200, tracks)
+            else:
+                self._send(404, {"error": {"status": 404, "message": "Service not found"}})
+
+    return Handler
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve recorded Spotify responses locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    fake = FakeSpotify(args.fixture, args.latency_ms, args.jitter_ms, args.rate_429, args.retry_after)
+    print(f"Fake Spotify listening on {fake.start(args.host, args.port)}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        fake.stop()
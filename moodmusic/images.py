@@ -0,0 +1,19 @@
+"""In-memory decoding of camera captures for DeepFace."""
+
+
+def decode_image_buffer(buffer):
+    """Decode encoded image bytes (e.g. ``img_file.getbuffer()``) to a BGR array.
+
+    ``np.frombuffer`` wraps the upload's memoryview without copying it, and
+    OpenCV decodes straight from that view, so no file ever touches disk.
+    The BGR channel order is what DeepFace expects for array inputs.
+    """
+    import cv2
+    import numpy as np
+
+    encoded = np.frombuffer(buffer, dtype=np.uint8)
+    image = cv2.imdecode(encoded, cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Could not decode the captured image")
+    return image
+
@@ -0,0 +1,111 @@
+"""Import-time profile of the app start-up paths.
+
+Streamlit imports the app script's dependencies before the page renders,
+so anything pulled in at module level is paid for on every cold start.
+The vision (DeepFace / TensorFlow, OpenCV) and transformer (PyTorch)
+stacks are only imported inside the functions that use them; this checks
+that a path really stays clear of them and shows where start-up time goes.
+
+    python -m moodmusic.importprofile text
+    python -m moodmusic.importprofile face --top 25
+    python -m moodmusic.importprofile text --check   # exit 1 if a heavy stack is imported
+
+Each path runs in a fresh interpreter under ``python -X importtime``.
+"""
+
+import re
+import subprocess
+import sys
+
+HEAVY = ("deepface", "tensorflow", "keras", "torch", "transformers", "onnxruntime", "cv2")
+
+_APP_IMPORTS = (
+    "import streamlit, spotipy\n"
+    "from moodmusic import ui\n"
+    "from moodmusic.detection import detect_face_mood, detect_text_mood\n"
+    "from moodmusic.recommend import recommend\n"
+    "from moodmusic.spotify import get_spotify_client\n"
+)
+
+PATHS = {
+    # Page render only: what every visitor waits for.
+    "startup": _APP_IMPORTS,
+    "text": _APP_IMPORTS + "detect_text_mood(\"I'm feeling great today!\")\n",
+    "transformers": _APP_IMPORTS + "detect_text_mood(\"I'm feeling great today!\", engine='transformers')\n",
+    "face": _APP_IMPORTS + (
+        "import cv2, numpy as np\n"
+        "ok, png = cv2.imencode('.png', np.zeros((240, 320, 3), np.uint8))\n"
+        "try:\n"
+        "    detect_face_mood(png.tobytes())\n"
+        "except Exception:\n"
+        "    pass\n"
+    ),
+}
+
+_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile(code):
+    """Run ``code`` under ``-X importtime``; return ``[(module, self_us, cumulative_us, depth)]``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    entries = []
+    for line in completed.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append((module, int(self_us), int(cumulative_us), len(indent) // 2))
+    return entries
+
+
+def heavy_modules(entries):
+    return sorted({module.split(".")[0] for module, *_ in entries} & set(HEAVY))
+
+
+def summarize(entries, top=15):
+    # Only top-level imports: their cumulative time already includes
+    # everything they pulled in.
+    roots = [entry for entry in entries if entry[3] == 0]
+    return {
+        "total_ms": sum(entry[2] for entry in roots) / 1000,
+        "modules": len(entries),
+        "heavy": heavy_modules(entries),
+        "slowest": [
+            (module, cumulative_us / 1000)
+            for module, _, cumulative_us, _ in sorted(roots, key=lambda e: e[2], reverse=True)[:top]
+        ],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profile start-up imports of the app paths.")
+    parser.add_argument("path", nargs="*", help=f"one or more of {', '.join(sorted(PATHS))} "
+                        "(default: startup text)")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 if a non-vision path imports a heavy stack")
+    args = parser.parse_args()
+    # argparse checks a list default against ``choices`` as a single value,
+    # so path names are validated here instead.
+    paths = args.path or ["startup", "text"]
+    unknown = [name for name in paths if name not in PATHS]
+    if unknown:
+        parser.error(f"unknown path {', '.join(unknown)}; choose from {', '.join(sorted(PATHS))}")
+
+    failed = False
+    for name in paths:
+        summary = summarize(profile(PATHS[name]), args.top)
+        print(f"== {name}: {summary['total_ms']:.0f} ms in imports, {summary['modules']} modules")
+        for module, ms in summary["slowest"]:
+            print(f"   {ms:8.1f} ms  {module}")
+        print(f"   heavy stacks: {', '.join(summary['heavy']) or 'none'}")
+        if name in ("startup", "text") and summary["heavy"]:
+            failed = True
+    if args.check and failed:
+        sys.exit(1)
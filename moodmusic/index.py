@@ -0,0 +1,361 @@
+"""Offline mood → track index served without per-request API calls.
+
+An ingestion job pulls the playlists and tracks for every genre in
+``MOOD_TO_GENRE`` into a raw catalog snapshot (the same JSON shape as
+``fixtures/catalog.json``). The snapshot is compiled into a compact
+``TrackIndex``: playlists are ordered by genre and tracks by playlist, so
+each genre and each playlist is a contiguous slice of array-backed
+columns, and a lookup is a couple of array slices.
+
+Every track also carries its Spotify valence/energy audio features (the
+genre's typical values when the snapshot has none), so ``recommend_point``
+can rank the whole catalog against a continuous mood point
+(``moodmusic.scoring``) in one vectorized pass.
+
+    python -m moodmusic.index ingest --out catalog.json   # needs credentials
+    python -m moodmusic.index build --catalog fixtures/catalog.json --out index.npz
+    python -m moodmusic.index query --index index.npz Happy
+    python -m moodmusic.index query --index index.npz --text "what a GREAT day!!"
+
+The Spotify API is only used by ``ingest``; run it periodically and the
+serving side picks up the new file through ``get_index()``.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from moodmusic.moods import DEFAULT_GENRE, GENRE_FEATURES, all_genres, genre_for_mood
+from moodmusic.scoring import rank
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.environ.get(
+    "MOODMUSIC_INDEX",
+    os.path.join(os.path.expanduser("~"), ".cache", "moodmusic", "index.npz"),
+)
+
+_PLAYLIST_COLUMNS = ("playlist_id", "playlist_name", "playlist_url", "playlist_image")
+_TRACK_COLUMNS = ("track_id", "track_name", "track_artists", "track_preview")
+_RANGE_COLUMNS = ("genre_start", "genre_stop", "track_start", "track_stop")
+_FEATURE_COLUMNS = ("track_valence", "track_energy")
+
+# recommend_point looks at this many nearest tracks per requested track
+# before falling back to ranking the whole catalog.
+_CANDIDATES_PER_TRACK = 8
+
+
+class TrackIndex:
+    def __init__(self, genres, columns):
+        self.genres = list(genres)
+        self._genre_codes = {genre: code for code, genre in enumerate(self.genres)}
+        for name, values in columns.items():
+            setattr(self, name, values)
+
+        # Per-row owners, so ranked tracks can be mapped back to playlists.
+        self.playlist_genre = np.repeat(
+            np.arange(len(self.genres), dtype=np.int32), self.genre_stop - self.genre_start
+        )
+        self.track_playlist = np.repeat(
+            np.arange(len(self.track_start), dtype=np.int32), self.track_stop - self.track_start
+        )
+        if not all(name in columns for name in _FEATURE_COLUMNS):
+            # Index built before audio features were stored.
+            priors = np.array(
+                [GENRE_FEATURES.get(genre, GENRE_FEATURES[DEFAULT_GENRE]) for genre in self.genres],
+                dtype=np.float32,
+            ).reshape(-1, 2)
+            track_priors = priors[self.playlist_genre[self.track_playlist]]
+            self.track_valence = np.ascontiguousarray(track_priors[:, 0])
+            self.track_energy = np.ascontiguousarray(track_priors[:, 1])
+
+    # ------------------------------
+    # 🏗️ BUILDING
+    # ------------------------------
+    @classmethod
+    def from_catalog(cls, catalog, genres=None):
+        """Compile a raw ``{"searches": ..., "tracks": ...}`` snapshot."""
+        genres = list(genres or sorted(catalog["searches"]))
+        features = catalog.get("features") or {}
+        playlists = {name: [] for name in _PLAYLIST_COLUMNS}
+        tracks = {name: [] for name in _TRACK_COLUMNS + _FEATURE_COLUMNS}
+        genre_start, genre_stop = [], []
+        track_start, track_stop = [], []
+
+        for genre in genres:
+            search = catalog["searches"].get(genre) or {}
+            prior = GENRE_FEATURES.get(genre, GENRE_FEATURES[DEFAULT_GENRE])
+            genre_start.append(len(playlists["playlist_id"]))
+            for playlist in search.get("playlists", {}).get("items", []):
+                if not playlist or not playlist.get("id"):
+                    continue
+                images = playlist.get("images") or [{}]
+                playlists["playlist_id"].append(playlist["id"])
+                playlists["playlist_name"].append(playlist.get("name", "Unnamed Playlist"))
+                playlists["playlist_url"].append(playlist.get("external_urls", {}).get("spotify", ""))
+                playlists["playlist_image"].append(images[0].get("url") or "")
+
+                track_start.append(len(tracks["track_id"]))
+                response = catalog["tracks"].get(playlist["id"]) or {}
+                for item in response.get("items", []):
+                    track = (item or {}).get("track")
+                    if not track:
+                        continue
+                    tracks["track_id"].append(track.get("id") or "")
+                    tracks["track_name"].append(track.get("name", "Unknown Track"))
+                    tracks["track_artists"].append(
+                        ", ".join(a["name"] for a in track.get("artists", []))
+                    )
+                    tracks["track_preview"].append(track.get("preview_url") or "")
+                    feature = features.get(track.get("id")) or {}
+                    tracks["track_valence"].append(feature.get("valence", prior[0]))
+                    tracks["track_energy"].append(feature.get("energy", prior[1]))
+                track_stop.append(len(tracks["track_id"]))
+            genre_stop.append(len(playlists["playlist_id"]))
+
+        columns = {name: np.array(values, dtype=str) for name, values in playlists.items()}
+        columns.update({name: np.array(tracks[name], dtype=str) for name in _TRACK_COLUMNS})
+        columns.update({name: np.array(tracks[name], dtype=np.float32) for name in _FEATURE_COLUMNS})
+        columns["genre_start"] = np.array(genre_start, dtype=np.int32)
+        columns["genre_stop"] = np.array(genre_stop, dtype=np.int32)
+        columns["track_start"] = np.array(track_start, dtype=np.int32)
+        columns["track_stop"] = np.array(track_stop, dtype=np.int32)
+        return cls(genres, columns)
+
+    @classmethod
+    def from_catalog_file(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_catalog(json.load(f))
+
+    # ------------------------------
+    # 💾 PERSISTENCE
+    # ------------------------------
+    def save(self, path):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        columns = _PLAYLIST_COLUMNS + _TRACK_COLUMNS + _RANGE_COLUMNS + _FEATURE_COLUMNS
+        arrays = {name: getattr(self, name) for name in columns}
+        arrays["genres"] = np.array(self.genres, dtype=str)
+        # Write then rename so readers never see a half-written index.
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            columns = {name: data[name] for name in data.files if name != "genres"}
+            return cls(data["genres"].tolist(), columns)
+
+    # ------------------------------
+    # 🔍 SERVING
+    # ------------------------------
+    def __len__(self):
+        return len(self.track_id)
+
+    def playlist_range(self, genre):
+        code = self._genre_codes.get(genre)
+        if code is None:
+            code = self._genre_codes.get(DEFAULT_GENRE)
+        if code is None:
+            return range(0)
+        return range(self.genre_start[code], self.genre_stop[code])
+
+    def playlist(self, i):
+        """Playlist ``i`` in the shape of a Spotify search item."""
+        image = str(self.playlist_image[i])
+        return {
+            "id": str(self.playlist_id[i]),
+            "name": str(self.playlist_name[i]),
+            "external_urls": {"spotify": str(self.playlist_url[i])},
+            "images": [{"url": image}] if image else [],
+        }
+
+    def playlist_tracks(self, i, limit=3):
+        """Tracks of playlist ``i`` in the shape of a ``playlist_tracks`` response."""
+        start = self.track_start[i]
+        stop = min(self.track_stop[i], start + limit)
+        return self._tracks_response(range(start, stop))
+
+    def _tracks_response(self, track_rows):
+        items = []
+        for t in track_rows:
+            preview = str(self.track_preview[t])
+            items.append({
+                "track": {
+                    "id": str(self.track_id[t]),
+                    "name": str(self.track_name[t]),
+                    "artists": [{"name": str(self.track_artists[t])}],
+                    "preview_url": preview or None,
+                }
+            })
+        return {"items": items}
+
+    def recommend(self, mood, limit=3, track_limit=3):
+        """Return ``(genre, [(playlist, tracks), ...])`` for ``mood``."""
+        genre = genre_for_mood(mood)
+        playlists = list(self.playlist_range(genre))[:limit]
+        return genre, [(self.playlist(i), self.playlist_tracks(i, track_limit)) for i in playlists]
+
+    def recommend_point(self, point, limit=3, track_limit=3):
+        """Return ``(genre, [(playlist, tracks), ...])`` nearest to a ``(valence, energy)`` point.
+
+        Playlists are ordered by their closest track and each lists its
+        ``track_limit`` closest tracks; ``genre`` is the best playlist's.
+        """
+        point = np.asarray(point, dtype=np.float32)
+        wanted = limit * track_limit * _CANDIDATES_PER_TRACK
+        order = rank(self.track_valence, self.track_energy, point, wanted)
+        picked = self._pick(order, limit, track_limit)
+        if len(order) < len(self) and not self._filled(picked, limit, track_limit):
+            # The nearest candidates were bunched in too few playlists.
+            order = rank(self.track_valence, self.track_energy, point, len(self))
+            picked = self._pick(order, limit, track_limit)
+
+        if not picked:
+            return DEFAULT_GENRE, []
+        genre = self.genres[self.playlist_genre[next(iter(picked))]]
+        return genre, [(self.playlist(i), self._tracks_response(rows)) for i, rows in picked.items()]
+
+    def _pick(self, order, limit, track_limit):
+        picked = {}
+        for t in order.tolist():
+            i = int(self.track_playlist[t])
+            rows = picked.get(i)
+            if rows is None:
+                if len(picked) >= limit:
+                    continue
+                rows = picked[i] = []
+            if len(rows) < track_limit:
+                rows.append(t)
+        return picked
+
+    def _filled(self, picked, limit, track_limit):
+        if len(picked) < min(limit, len(self.track_start)):
+            return False
+        return all(
+            len(rows) >= min(track_limit, self.track_stop[i] - self.track_start[i])
+            for i, rows in picked.items()
+        )
+
+
+# ------------------------------
+# 📥 INGESTION
+# ------------------------------
+def ingest(sp, genres=None, playlists_per_genre=5, tracks_per_playlist=20):
+    """Pull a raw catalog snapshot from Spotify for every genre."""
+    catalog = {"searches": {}, "tracks": {}, "features": {}}
+    for genre in genres or all_genres():
+        results = sp.search(q=f"playlist {genre}", type="playlist", limit=playlists_per_genre)
+        catalog["searches"][genre] = results
+        for playlist in (results or {}).get("playlists", {}).get("items", []):
+            if playlist and playlist.get("id") and playlist["id"] not in catalog["tracks"]:
+                catalog["tracks"][playlist["id"]] = sp.playlist_tracks(
+                    playlist["id"], limit=tracks_per_playlist
+                )
+
+    track_ids = sorted({
+        item["track"]["id"]
+        for response in catalog["tracks"].values()
+        for item in (response or {}).get("items", [])
+        if item and item.get("track") and item["track"].get("id")
+    })
+    try:
+        # The endpoint takes at most 100 ids per call.
+        for i in range(0, len(track_ids), 100):
+            for feature in sp.audio_features(track_ids[i:i + 100]) or []:
+                if feature:
+                    catalog["features"][feature["id"]] = {
+                        "valence": feature["valence"],
+                        "energy": feature["energy"],
+                    }
+    except Exception as e:
+        # Newer Spotify apps are refused audio features; fall back to the
+        # per-genre defaults when the index is built.
+        logger.warning("Audio features unavailable (%s); using genre defaults", e)
+    return catalog
+
+
+_index = None
+_index_mtime = None
+_index_lock = threading.Lock()
+
+
+def get_index(path=DEFAULT_PATH):
+    """Return the process-wide index, reloading it when the file changes."""
+    global _index, _index_mtime
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    if _index is not None and mtime == _index_mtime:
+        return _index
+    with _index_lock:
+        if _index is None or mtime != _index_mtime:
+            _index = TrackIndex.load(path)
+            _index_mtime = mtime
+    return _index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build and query the offline mood index.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    ingest_parser = subcommands.add_parser("ingest", help="pull a catalog snapshot from Spotify")
+    ingest_parser.add_argument("--client-id", default=os.environ.get("SPOTIPY_CLIENT_ID"))
+    ingest_parser.add_argument("--client-secret", default=os.environ.get("SPOTIPY_CLIENT_SECRET"))
+    ingest_parser.add_argument("--out", required=True)
+
+    build_parser = subcommands.add_parser("build", help="compile a catalog snapshot into an index")
+    build_parser.add_argument("--catalog", required=True)
+    build_parser.add_argument("--out", default=DEFAULT_PATH)
+
+    query_parser = subcommands.add_parser("query", help="look up recommendations for a mood")
+    query_parser.add_argument("--index", default=DEFAULT_PATH)
+    query_parser.add_argument("mood", nargs="?", help="rank by the mood's genre")
+    query_parser.add_argument("--text", help="rank tracks by valence/energy distance to this text")
+
+    args = parser.parse_args()
+
+    if args.command == "ingest":
+        if not args.client_id or not args.client_secret:
+            parser.error("Spotify credentials are required (--client-id/--client-secret)")
+        from moodmusic.spotify import get_spotify_client
+
+        snapshot = ingest(get_spotify_client(args.client_id, args.client_secret))
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        print(f"Wrote {len(snapshot['tracks'])} playlists to {args.out}")
+
+    elif args.command == "build":
+        index = TrackIndex.from_catalog_file(args.catalog)
+        index.save(args.out)
+        print(f"Indexed {len(index.playlist_id)} playlists / {len(index)} tracks into {args.out}")
+
+    else:
+        if (args.mood is None) == (args.text is None):
+            parser.error("give either a mood or --text")
+        index = TrackIndex.load(args.index)
+        if args.text is not None:
+            from moodmusic.scoring import text_point
+
+            point = text_point(args.text)
+            start = time.perf_counter()
+            genre, results = index.recommend_point(point)
+            elapsed_us = (time.perf_counter() - start) * 1e6
+            print(f"valence {point[0]:.2f}, energy {point[1]:.2f} → {genre} ({elapsed_us:.0f} µs)")
+        else:
+            start = time.perf_counter()
+            genre, results = index.recommend(args.mood)
+            elapsed_us = (time.perf_counter() - start) * 1e6
+            print(f"{args.mood} → {genre} ({elapsed_us:.0f} µs)")
+        for playlist, tracks in results:
+            print(f"  {playlist['name']}")
+            for item in tracks["items"]:
+                print(f"    {item['track']['name']} — {item['track']['artists'][0]['name']}")
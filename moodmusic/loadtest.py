@@ -0,0 +1,185 @@
+"""Offline load generator for the recommendation flow.
+
+Starts a ``FakeSpotify`` server (unless ``--spotify`` points at a running
+one), then drives text → mood → playlists → tracks at ``--users``
+concurrent users and reports latency percentiles, throughput and errors.
+
+    python -m moodmusic.loadtest --users 50 --duration 30 --latency-ms 80 --rate-429 0.02
+    python -m moodmusic.loadtest --api http://127.0.0.1:8000 --users 200
+
+``--cold`` clears the in-memory catalog caches before every request and
+points the catalog store at a throwaway file, so each request reaches the
+(fake) API; otherwise steady-state cache hits are measured.
+"""
+
+import json
+import random
+import statistics
+import tempfile
+import threading
+import time
+import urllib.request
+from collections import Counter
+
+SAMPLE_TEXTS = [
+    "I'm feeling great today!",
+    "I'm really tired and a bit down...",
+    "Just another ordinary day.",
+    "This is the best weekend ever",
+    "Everything is going wrong",
+    "Calm and relaxed, nothing much",
+]
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank ``pct`` percentile of an already sorted list (NaN if empty)."""
+    if not sorted_values:
+        return float("nan")
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _in_process_flow(spotify_url, cold):
+    from moodmusic import catalog
+    from moodmusic.detection import detect_text_mood
+    from moodmusic.recommend import recommend
+    from moodmusic.spotify import get_spotify_client
+
+    sp = get_spotify_client("load-test", "load-test", api_base=spotify_url)
+
+    def flow(text):
+        if cold:
+            catalog.search_cache.clear()
+            catalog.tracks_cache.clear()
+        mood, _ = detect_text_mood(text)
+        return recommend(sp, mood)
+
+    return flow
+
+
+def _api_flow(api_url):
+    endpoint = f"{api_url.rstrip('/')}/recommend"
+
+    def flow(text):
+        request = urllib.request.Request(
+            endpoint, data=json.dumps({"text": text}).encode(),
+            headers={"Content-Type": "application/json"}, method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.load(response)
+
+    return flow
+
+
+def run(flow, users, duration=None, requests_per_user=None):
+    """Drive ``flow`` from ``users`` threads; return a stats dict."""
+    latencies, errors = [], Counter()
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration if duration else None
+
+    def user(seed):
+        rng = random.Random(seed)
+        done = 0
+        while True:
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            if requests_per_user is not None and done >= requests_per_user:
+                return
+            start = time.perf_counter()
+            try:
+                flow(rng.choice(SAMPLE_TEXTS))
+                elapsed = time.perf_counter() - start
+                with lock:
+                    latencies.append(elapsed)
+            except Exception as e:
+                with lock:
+                    errors[type(e).__name__] += 1
+            done += 1
+
+    threads = [threading.Thread(target=user, args=(i,)) for i in range(users)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    total = len(latencies) + sum(errors.values())
+    return {
+        "users": users,
+        "requests": total,
+        "wall_s": wall,
+        "throughput_rps": total / wall if wall else 0.0,
+        "error_rate": sum(errors.values()) / total if total else 0.0,
+        "errors": dict(errors),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else float("nan"),
+    }
+
+
+def print_report(stats):
+    print(f"{stats['requests']} requests from {stats['users']} users in {stats['wall_s']:.1f}s "
+          f"→ {stats['throughput_rps']:.1f} req/s")
+    print(f"latency p50 {stats['p50_ms']:.1f} ms  p95 {stats['p95_ms']:.1f} ms  "
+          f"p99 {stats['p99_ms']:.1f} ms  mean {stats['mean_ms']:.1f} ms")
+    print(f"error rate {stats['error_rate']:.2%} {stats['errors'] or ''}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import logging
+    import os
+
+    parser = argparse.ArgumentParser(description="Load-test the recommendation flow offline.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds (ignored with --requests)")
+    parser.add_argument("--requests", type=int, help="requests per user")
+    parser.add_argument("--api", help="drive a running HTTP API instead of the in-process flow")
+    parser.add_argument("--spotify", help="base URL of an already running fake Spotify")
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--cold", action="store_true", help="bypass catalog caches on every request")
+    parser.add_argument("--json", action="store_true", help="print the stats as JSON")
+    args = parser.parse_args()
+
+    # Throttled and failed calls are counted in the report; spotipy would
+    # otherwise log every one of them.
+    logging.getLogger("spotipy").setLevel(logging.CRITICAL)
+
+    fake = None
+    if args.api:
+        flow = _api_flow(args.api)
+    else:
+        spotify_url = args.spotify
+        if spotify_url is None:
+            from moodmusic.fake_spotify import FakeSpotify
+
+            fake = FakeSpotify(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                               rate_429=args.rate_429, seed=0)
+            spotify_url = fake.start()
+        # Keep the run offline and repeatable: never touch the real
+        # catalog store, and start every run from an empty one.
+        os.environ["MOODMUSIC_CATALOG_DB"] = os.path.join(tempfile.mkdtemp(), "catalog.sqlite3")
+        if args.cold:
+            from moodmusic import store
+
+            cold_store = store.get_store()
+            cold_store.fresh_for = cold_store.max_stale = -1
+        flow = _in_process_flow(spotify_url, args.cold)
+
+    duration = None if args.requests else args.duration
+    stats = run(flow, args.users, duration, args.requests)
+    if fake is not None:
+        stats["fake_spotify"] = {"requests": fake.requests, "throttled": fake.throttled}
+        fake.stop()
+
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print_report(stats)
+        if fake is not None:
+            print(f"fake Spotify served {fake.requests} API calls ({fake.throttled} throttled with 429)")
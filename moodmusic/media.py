@@ -0,0 +1,122 @@
+"""Download and disk-cache helpers for Spotify CDN media.
+
+Shared by the artwork thumbnails (``moodmusic.artwork``) and the preview
+clips (``moodmusic.previews``). Only Spotify's CDN hosts are fetched; set
+``MOODMUSIC_CDN_HOSTS`` (comma separated) to allow others, e.g. a local
+stand-in. The older ``MOODMUSIC_ARTWORK_HOSTS`` is still read when it is
+unset.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+CDN_HOSTS = tuple(
+    (
+        os.environ.get("MOODMUSIC_CDN_HOSTS")
+        or os.environ.get("MOODMUSIC_ARTWORK_HOSTS")
+        or "scdn.co,spotifycdn.com"
+    ).split(",")
+)
+# Spotify CDN URLs are content-addressed, so a URL never changes content.
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def is_spotify_cdn(url):
+    parsed = urlparse(url or "")
+    host = parsed.hostname or ""
+    return parsed.scheme in ("http", "https") and any(
+        host == allowed or host.endswith(f".{allowed}") for allowed in CDN_HOSTS
+    )
+
+
+def url_key(url):
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+def download(session, url, timeout, max_bytes, content_type):
+    """GET ``url`` and return its body; refuses other content types and bodies over ``max_bytes``."""
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        if not response.headers.get("Content-Type", content_type).startswith(content_type):
+            raise ValueError(f"Expected {content_type}* from {url}")
+        data = response.raw.read(max_bytes + 1, decode_content=True)
+    if len(data) > max_bytes:
+        raise ValueError(f"Body larger than {max_bytes} bytes: {url}")
+    return data
+
+
+class DiskLRU:
+    """Files in ``directory`` capped at ``max_bytes``, least recently used evicted first."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+        # file name → size, least recently used first. File mtimes carry the
+        # order across restarts; every read bumps the file's mtime.
+        os.makedirs(directory, exist_ok=True)
+        files = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        self._files = OrderedDict((name, size) for _, name, size in sorted(files))
+        self._bytes = sum(self._files.values())
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._files
+
+    def get(self, name):
+        path = os.path.join(self.directory, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            # Evicted, possibly by another worker process sharing the directory.
+            with self._lock:
+                self._bytes -= self._files.pop(name, 0)
+            return None
+        now = time.time()
+        os.utime(path, (now, now))
+        with self._lock:
+            if name in self._files:
+                self._files.move_to_end(name)
+        return data
+
+    def put(self, name, data):
+        path = os.path.join(self.directory, name)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        evict = []
+        with self._lock:
+            self._bytes += len(data) - self._files.pop(name, 0)
+            self._files[name] = len(data)
+            while self._bytes > self.max_bytes and len(self._files) > 1:
+                old_name, size = self._files.popitem(last=False)
+                self._bytes -= size
+                self.evictions += 1
+                evict.append(old_name)
+        for old_name in evict:
+            try:
+                os.remove(os.path.join(self.directory, old_name))
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        with self._lock:
+            return {
+                "files": len(self._files),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions,
+            }
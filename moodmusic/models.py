@@ -0,0 +1,121 @@
+"""Process-wide registry for heavy ML models.
+
+Streamlit reruns the whole app script on every interaction, but imported
+modules stay resident for the lifetime of the server process. Models kept
+here are therefore loaded once and shared by every session until evicted.
+"""
+
+import threading
+
+
+class _SharedModel:
+    # Serializes calls so a single loaded model can be used from all the
+    # session threads Streamlit runs concurrently (HF fast tokenizers are
+    # not safe to call from several threads at once).
+    def __init__(self, model):
+        self.model = model
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            return self.model(*args, **kwargs)
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaders = {}
+        self._models = {}
+        self._load_locks = {}
+
+    def register(self, name, loader):
+        with self._lock:
+            self._loaders[name] = loader
+            self._load_locks.setdefault(name, threading.Lock())
+
+    def get(self, name):
+        model = self._models.get(name)
+        if model is not None:
+            return model
+
+        with self._lock:
+            if name not in self._loaders:
+                raise KeyError(f"No model registered under '{name}'")
+            load_lock = self._load_locks[name]
+
+        # Per-model lock: concurrent first requests wait for one load
+        # instead of each pulling the weights from disk.
+        with load_lock:
+            model = self._models.get(name)
+            if model is None:
+                model = _SharedModel(self._loaders[name]())
+                self._models[name] = model
+        return model
+
+    def is_loaded(self, name):
+        return name in self._models
+
+    def evict(self, name):
+        with self._lock:
+            return self._models.pop(name, None) is not None
+
+    def evict_all(self):
+        with self._lock:
+            self._models.clear()
+
+
+registry = ModelRegistry()
+
+
+# ------------------------------
+# 🧠 SENTIMENT PIPELINE
+# ------------------------------
+def _load_sentiment_pipeline():
+    from moodmusic import onnx_sentiment
+
+    # Prefer the exported int8 ONNX model when it has been built.
+    if onnx_sentiment.is_available():
+        return onnx_sentiment.OnnxSentiment()
+
+    from transformers import pipeline
+
+    return pipeline("sentiment-analysis", model=onnx_sentiment.SENTIMENT_MODEL)
+
+
+registry.register("sentiment", _load_sentiment_pipeline)
+
+
+def get_sentiment_pipeline():
+    return registry.get("sentiment")
+
+
+def label_to_mood(label):
+    label = label.lower()
+    if label == "positive":
+        return "Happy"
+    if label == "negative":
+        return "Sad"
+    return "Neutral"
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def get_sentiment_batcher():
+    """Shared micro-batcher in front of the sentiment pipeline.
+
+    ``get_sentiment_batcher()(text)`` returns the same ``{"label", "score"}``
+    dict as ``get_sentiment_pipeline()(text)[0]``, but concurrent callers
+    are served by one batched forward pass.
+    """
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            from moodmusic.batching import MicroBatcher
+
+            _batcher = MicroBatcher(
+                lambda texts: get_sentiment_pipeline()(texts, batch_size=len(texts)),
+                name="sentiment-batcher",
+            )
+        return _batcher
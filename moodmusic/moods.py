@@ -0,0 +1,51 @@
+"""Mood → Spotify genre mapping shared by the app variants.
+
+The camera apps use all seven DeepFace emotions; the text apps only ever
+produce Happy, Sad and Neutral, which map to the same genres.
+
+For continuous scoring (``moodmusic.scoring``) genres are also placed on
+Spotify's valence/energy plane, both axes in [0, 1].
+"""
+
+DEFAULT_GENRE = "chill"
+
+HAPPY_THRESHOLD = 0.2
+SAD_THRESHOLD = -0.2
+
+MOOD_TO_GENRE = {
+    "Happy": "pop",
+    "Sad": "acoustic",
+    "Angry": "rock",
+    "Surprise": "dance",
+    "Fear": "ambient",
+    "Neutral": "chill",
+    "Disgust": "metal",
+}
+
+# Typical valence/energy of each genre, used for tracks without audio
+# features.
+GENRE_FEATURES = {
+    "pop": (0.65, 0.70),
+    "acoustic": (0.40, 0.30),
+    "rock": (0.45, 0.80),
+    "dance": (0.65, 0.85),
+    "ambient": (0.30, 0.20),
+    "chill": (0.50, 0.35),
+    "metal": (0.30, 0.90),
+}
+
+
+def mood_from_polarity(polarity):
+    if polarity > HAPPY_THRESHOLD:
+        return "Happy"
+    if polarity < SAD_THRESHOLD:
+        return "Sad"
+    return "Neutral"
+
+
+def genre_for_mood(mood):
+    return MOOD_TO_GENRE.get(mood, DEFAULT_GENRE)
+
+
+def all_genres():
+    return sorted(set(MOOD_TO_GENRE.values()) | {DEFAULT_GENRE})
@@ -0,0 +1,219 @@
+"""ONNX Runtime int8 inference path for the sentiment model.
+
+The default ``pipeline("sentiment-analysis")`` runs DistilBERT in fp32
+PyTorch. ``export`` converts the same checkpoint to ONNX and applies
+dynamic int8 quantization; ``OnnxSentiment`` serves it with ONNX Runtime
+and returns the same ``[{"label", "score"}]`` output as the pipeline, so
+the POSITIVE/NEGATIVE → Happy/Sad/Neutral mapping is unchanged.
+
+    python -m moodmusic.onnx_sentiment export --out ~/.cache/moodmusic/sentiment-onnx
+    python -m moodmusic.onnx_sentiment bench
+
+``moodmusic.models`` picks the exported model up automatically when
+``onnxruntime`` is installed and the directory in
+``MOODMUSIC_SENTIMENT_ONNX`` contains it.
+
+Requires ``torch`` and ``onnxruntime`` to export, only ``onnxruntime`` and
+``transformers`` (for the tokenizer) to serve.
+"""
+
+import json
+import os
+
+import numpy as np
+
+SENTIMENT_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+DEFAULT_DIR = os.environ.get(
+    "MOODMUSIC_SENTIMENT_ONNX",
+    os.path.join(os.path.expanduser("~"), ".cache", "moodmusic", "sentiment-onnx"),
+)
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+MAX_LENGTH = 512
+
+
+def is_available(model_dir=DEFAULT_DIR):
+    if not os.path.exists(os.path.join(model_dir, INT8_FILE)):
+        return False
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def export(out_dir=DEFAULT_DIR, model_name=SENTIMENT_MODEL):
+    """Export ``model_name`` to ONNX and write a dynamically quantized int8 copy."""
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    sample = tokenizer(["I'm feeling great today!"], return_tensors="pt")
+    fp32_path = os.path.join(out_dir, FP32_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["logits"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "logits": {0: "batch"},
+            },
+            opset_version=14,
+        )
+
+    quantize_dynamic(fp32_path, os.path.join(out_dir, INT8_FILE), weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(out_dir)
+    model.config.save_pretrained(out_dir)
+    return out_dir
+
+
+class OnnxSentiment:
+    def __init__(self, model_dir=DEFAULT_DIR, model_file=INT8_FILE, threads=None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        with open(os.path.join(model_dir, "config.json"), encoding="utf-8") as f:
+            id2label = json.load(f)["id2label"]
+        self.labels = [id2label[str(i)] for i in range(len(id2label))]
+
+    def __call__(self, texts, batch_size=None):
+        if isinstance(texts, str):
+            texts = [texts]
+        batch_size = batch_size or len(texts) or 1
+        results = []
+        for i in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[i:i + batch_size], padding=True, truncation=True,
+                max_length=MAX_LENGTH, return_tensors="np",
+            )
+            (logits,) = self.session.run(None, {
+                "input_ids": encoded["input_ids"].astype(np.int64),
+                "attention_mask": encoded["attention_mask"].astype(np.int64),
+            })
+            logits = logits - logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+            best = probs.argmax(axis=1)
+            results.extend(
+                {"label": self.labels[k], "score": float(probs[row, k])}
+                for row, k in enumerate(best)
+            )
+        return results
+
+
+# ------------------------------
+# 📊 BENCHMARK
+# ------------------------------
+_BENCH_TEXTS = [
+    "I'm feeling great today!",
+    "I'm really tired and a bit down...",
+    "Nothing special, just another day at work.",
+    "This is the worst week ever, everything went wrong.",
+    "Honestly not bad, could be better.",
+    "I love this song so much!",
+    "I can't stop crying.",
+    "Meh.",
+]
+
+
+def _rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _measure(engine, model_dir, repeats):
+    # Runs in a fresh process per engine so RSS numbers are not mixed.
+    import statistics
+    import time
+
+    from moodmusic.models import label_to_mood
+
+    baseline = _rss_mb()
+    if engine == "onnx":
+        model = OnnxSentiment(model_dir)
+    else:
+        from transformers import pipeline
+
+        model = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
+    model(_BENCH_TEXTS)  # warm up
+
+    latencies = []
+    for _ in range(repeats):
+        for text in _BENCH_TEXTS:
+            start = time.perf_counter()
+            model(text)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    texts = _BENCH_TEXTS * repeats
+    start = time.perf_counter()
+    outputs = model(texts, batch_size=32)
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": statistics.quantiles(latencies, n=20)[-1],
+        "throughput": throughput,
+        "rss_mb": _rss_mb() - baseline,
+        "moods": [label_to_mood(out["label"]) for out in outputs],
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import subprocess
+    import sys
+
+    parser = argparse.ArgumentParser(description="Export and benchmark the ONNX sentiment model.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    export_parser = subcommands.add_parser("export")
+    export_parser.add_argument("--out", default=DEFAULT_DIR)
+    bench_parser = subcommands.add_parser("bench")
+    bench_parser.add_argument("--model-dir", default=DEFAULT_DIR)
+    bench_parser.add_argument("--repeats", type=int, default=25)
+    measure_parser = subcommands.add_parser("_measure")
+    measure_parser.add_argument("engine", choices=["eager", "onnx"])
+    measure_parser.add_argument("--model-dir", default=DEFAULT_DIR)
+    measure_parser.add_argument("--repeats", type=int, default=25)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        print(f"Exported int8 model to {export(args.out)}")
+
+    elif args.command == "_measure":
+        print(json.dumps(_measure(args.engine, args.model_dir, args.repeats)))
+
+    else:
+        stats = {}
+        for engine in ("eager", "onnx"):
+            output = subprocess.run(
+                [sys.executable, "-m", "moodmusic.onnx_sentiment", "_measure", engine,
+                 "--model-dir", args.model_dir, "--repeats", str(args.repeats)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            stats[engine] = json.loads(output.strip().splitlines()[-1])
+
+        for engine, result in stats.items():
+            print(f"{engine:<6} p50 {result['p50_ms']:6.1f} ms  p95 {result['p95_ms']:6.1f} ms  "
+                  f"{result['throughput']:7.1f} texts/s  +{result['rss_mb']:.0f} MB RSS")
+        pairs = list(zip(stats["eager"]["moods"], stats["onnx"]["moods"]))
+        agreement = sum(a == b for a, b in pairs) / len(pairs)
+        print(f"mood agreement: {agreement:.1%}")
@@ -0,0 +1,76 @@
+"""Perceptual-hash index of recently analyzed selfies.
+
+Retaken selfies are rarely byte-identical, but they are visually almost
+the same. A 64-bit difference hash (dHash) is computed per frame; a new
+frame within ``max_distance`` bits (Hamming distance) of a cached one
+reuses that frame's emotion result instead of running the CNN.
+"""
+
+import threading
+from collections import OrderedDict
+
+HASH_SIZE = 8
+
+
+def dhash(image, hash_size=HASH_SIZE):
+    """64-bit difference hash of a BGR or grayscale image array."""
+    import cv2
+
+    if image.ndim == 3:
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    small = cv2.resize(image, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+class PerceptualCache:
+    def __init__(self, max_entries=256, max_distance=6):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, image_hash):
+        """Return the result of the closest frame within ``max_distance``, else ``None``."""
+        with self._lock:
+            best_hash, best_distance = None, self.max_distance + 1
+            for cached_hash in self._entries:
+                distance = hamming(image_hash, cached_hash)
+                if distance < best_distance:
+                    best_hash, best_distance = cached_hash, distance
+                    if distance == 0:
+                        break
+            if best_hash is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_hash)
+            self.hits += 1
+            return self._entries[best_hash]
+
+    def add(self, image_hash, result):
+        with self._lock:
+            self._entries[image_hash] = result
+            self._entries.move_to_end(image_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,159 @@
+"""Selfie preprocessing before emotion analysis.
+
+Camera frames used to go to ``DeepFace.analyze`` at full resolution, so
+face detection scanned the whole image on CPU. Here a frame is decoded
+once, downscaled so its longest side is at most ``max_side``, converted
+to grayscale once (shared by face detection and perceptual hashing), and
+only the face crop found by the configured detector (see
+``moodmusic.detectors``) is handed to the emotion model.
+
+Compare against the full-frame path on a folder of selfies with::
+
+    python -m moodmusic.preprocess [path/to/faces/]
+
+(``fixtures/faces`` by default).
+"""
+
+import os
+import time
+from dataclasses import dataclass, field
+
+MAX_SIDE = 640
+FACE_MARGIN = 0.2
+DEFAULT_FACES = os.path.join(os.path.dirname(os.path.dirname(__file__)), "fixtures", "faces")
+
+
+@dataclass
+class Frame:
+    image: object
+    gray: object
+    face: object = None
+    face_box: tuple = None
+    backend: str = "opencv"
+    timings: dict = field(default_factory=dict)
+
+
+def downscale(image, max_side=MAX_SIDE):
+    import cv2
+
+    height, width = image.shape[:2]
+    scale = max_side / max(height, width)
+    if scale >= 1:
+        return image
+    size = (round(width * scale), round(height * scale))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def crop(image, box, margin=FACE_MARGIN):
+    x, y, w, h = box
+    pad_x, pad_y = int(w * margin), int(h * margin)
+    height, width = image.shape[:2]
+    return image[max(0, y - pad_y):min(height, y + h + pad_y), max(0, x - pad_x):min(width, x + w + pad_x)]
+
+
+def preprocess(image, max_side=MAX_SIDE, detector=None):
+    """Downscale, grayscale and face-crop a decoded BGR frame."""
+    import cv2
+
+    from moodmusic.detectors import get_face_detector
+
+    detector = detector or get_face_detector()
+
+    timings = {}
+    start = time.perf_counter()
+    image = downscale(image, max_side)
+    timings["downscale"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+    timings["grayscale"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    box = detector.detect(image, gray)
+    timings["face_detection"] = time.perf_counter() - start
+
+    face = crop(image, box) if box else None
+    return Frame(image=image, gray=gray, face=face, face_box=box, backend=detector.backend,
+                 timings=timings)
+
+
+def face_image_paths(parser, directory):
+    """Sorted .jpg/.png paths in ``directory`` for the benchmark CLIs; ``parser.error`` if none."""
+    paths = sorted(
+        os.path.join(directory, name)
+        for name in os.listdir(directory)
+        if name.lower().endswith((".jpg", ".jpeg", ".png"))
+    )
+    if not paths:
+        parser.error(f"No images found in {directory}")
+    return paths
+
+
+def analyze_emotion(frame):
+    """Run the emotion model on the face crop, or the whole frame if none was found."""
+    from deepface import DeepFace
+
+    # Detection already ran in ``preprocess``; when it found no face, running
+    # it again on the same frame would only repeat the slowest stage.
+    image = frame.face if frame.face is not None else frame.image
+    start = time.perf_counter()
+    result = DeepFace.analyze(
+        img_path=image, actions=["emotion"], detector_backend="skip", enforce_detection=False
+    )
+    frame.timings["emotion"] = time.perf_counter() - start
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import statistics
+
+    import cv2
+    from deepface import DeepFace
+
+    from moodmusic.detectors import get_face_detector
+    from moodmusic.images import decode_image_buffer
+
+    parser = argparse.ArgumentParser(description="Benchmark preprocessing against full-frame analysis.")
+    parser.add_argument("faces", nargs="?", default=DEFAULT_FACES,
+                        help="directory of face images (.jpg/.png)")
+    parser.add_argument("--max-side", type=int, default=MAX_SIDE)
+    args = parser.parse_args()
+
+    paths = face_image_paths(parser, args.faces)
+
+    # Build models before timing anything: DeepFace's default detector for
+    # the full-frame path, and the configured one for ours.
+    DeepFace.analyze(img_path=cv2.imread(paths[0]), actions=["emotion"], enforce_detection=False)
+    detector = get_face_detector()
+    analyze_emotion(preprocess(cv2.imread(paths[0]), args.max_side, detector))
+
+    stages = {}
+    full_times, agree = [], 0
+    for path in paths:
+        with open(path, "rb") as f:
+            encoded = f.read()
+
+        start = time.perf_counter()
+        decoded = decode_image_buffer(encoded)
+        decode_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        full = DeepFace.analyze(img_path=decoded, actions=["emotion"], enforce_detection=False)
+        full_times.append(decode_time + time.perf_counter() - start)
+
+        frame = preprocess(decoded, args.max_side, detector)
+        result = analyze_emotion(frame)
+        frame.timings["decode"] = decode_time
+        for stage, seconds in frame.timings.items():
+            stages.setdefault(stage, []).append(seconds)
+
+        agree += full[0]["dominant_emotion"] == result[0]["dominant_emotion"]
+
+    total = [sum(values) for values in zip(*stages.values())]
+    print(f"{len(paths)} images, max side {args.max_side}px, detector {detector.backend}")
+    print(f"full frame:   {statistics.median(full_times) * 1000:8.1f} ms median")
+    print(f"preprocessed: {statistics.median(total) * 1000:8.1f} ms median")
+    for stage, values in stages.items():
+        print(f"  {stage:<15}{statistics.median(values) * 1000:8.1f} ms median")
+    print(f"dominant emotion agreement: {agree}/{len(paths)} ({agree / len(paths):.0%})")
@@ -0,0 +1,170 @@
+"""Background prefetch of 30-second preview clips.
+
+Each ``st.audio(preview_url)`` used to start a cold fetch from Spotify's
+CDN when the user pressed play. With prefetching enabled
+(``MOODMUSIC_PREFETCH_PREVIEWS=1``), the first ``top_k`` previews of a
+recommendation are downloaded in the background into a size-bounded
+disk cache, and ``preview_src`` serves cached clips locally.
+
+Prefetching never competes with the interactive path:
+
+* downloads run on a small dedicated pool (``workers``) with its own HTTP
+  session, so they never hold Spotify API connections or scheduler slots;
+* at most ``max_pending`` clips are queued; further requests are dropped
+  and counted rather than building a backlog;
+* ``preview_src`` only reads the disk cache and never waits for a
+  download in progress.
+
+With ``MOODMUSIC_PREVIEW_PROXY`` set (e.g. ``http://127.0.0.1:8000/preview``,
+served by ``moodmusic.api``) the browser is pointed at the proxy instead.
+"""
+
+import concurrent.futures
+import logging
+import os
+import threading
+from urllib.parse import urlencode
+
+from moodmusic.media import DiskLRU, download, is_spotify_cdn, url_key
+from moodmusic.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIR = os.environ.get(
+    "MOODMUSIC_PREVIEW_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "moodmusic", "previews"),
+)
+MAX_BYTES = int(float(os.environ.get("MOODMUSIC_PREVIEW_MAX_MB", "500")) * 1024 * 1024)
+PREFETCH = os.environ.get("MOODMUSIC_PREFETCH_PREVIEWS", "0") == "1"
+PROXY_URL = os.environ.get("MOODMUSIC_PREVIEW_PROXY")
+
+TOP_K = 6
+WORKERS = 2
+MAX_PENDING = 32
+FETCH_TIMEOUT = 10.0
+# A 30-second 96-160 kbps MP3 is well under 1 MB.
+MAX_CLIP_BYTES = 5 * 1024 * 1024
+
+
+class PreviewCache:
+    def __init__(self, directory=DEFAULT_DIR, max_bytes=MAX_BYTES, workers=WORKERS,
+                 max_pending=MAX_PENDING, timeout=FETCH_TIMEOUT):
+        self.files = DiskLRU(directory, max_bytes)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="preview-prefetch"
+        )
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._flights = SingleFlight()
+        self._session = None
+        self.fetches = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def get(self, url):
+        """Cached clip bytes for ``url``, or ``None``; never downloads."""
+        return self.files.get(f"{url_key(url)}.mp3")
+
+    def fetch(self, url):
+        """Clip bytes for ``url``, downloading and caching them on a miss."""
+        if not is_spotify_cdn(url):
+            raise ValueError(f"Not a Spotify preview URL: {url}")
+        data = self.get(url)
+        if data is not None:
+            return data
+
+        def load():
+            import requests
+
+            if self._session is None:
+                self._session = requests.Session()
+            data = download(self._session, url, self.timeout, MAX_CLIP_BYTES, "audio/")
+            self.files.put(f"{url_key(url)}.mp3", data)
+            with self._lock:
+                self.fetches += 1
+            return data
+
+        return self._flights.do(url, load)
+
+    def _prefetch_one(self, url):
+        try:
+            self.fetch(url)
+        except Exception as e:
+            with self._lock:
+                self.failures += 1
+            logger.info("Could not prefetch preview %s: %s", url, e)
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+    def prefetch(self, urls):
+        """Queue background downloads of ``urls`` not cached yet; returns how many were queued."""
+        queued = 0
+        for url in urls:
+            if not is_spotify_cdn(url) or f"{url_key(url)}.mp3" in self.files:
+                continue
+            with self._lock:
+                if url in self._pending:
+                    continue
+                if len(self._pending) >= self.max_pending:
+                    self.dropped += 1
+                    continue
+                self._pending.add(url)
+            self._executor.submit(self._prefetch_one, url)
+            queued += 1
+        return queued
+
+    def stats(self):
+        stats = self.files.stats()
+        with self._lock:
+            stats.update(
+                pending=len(self._pending),
+                fetches=self.fetches,
+                failures=self.failures,
+                dropped=self.dropped,
+            )
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_preview_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PreviewCache()
+        return _cache
+
+
+def preview_urls(playlists, top_k=TOP_K):
+    """The first ``top_k`` preview URLs of ``playlists``, in page order."""
+    urls = [
+        track.preview_url
+        for playlist in playlists
+        for track in playlist.tracks
+        if track.preview_url
+    ]
+    return urls[:top_k]
+
+
+def prefetch_previews(playlists, top_k=TOP_K):
+    """Prefetch the top previews of ``playlists`` when prefetching is enabled."""
+    if not PREFETCH:
+        return 0
+    return get_preview_cache().prefetch(preview_urls(playlists, top_k))
+
+
+def preview_src(url):
+    """What to hand ``st.audio`` for ``url``: a proxy URL, cached clip bytes or ``url``."""
+    if not url or not is_spotify_cdn(url):
+        return url
+    if PROXY_URL:
+        return f"{PROXY_URL}?{urlencode({'url': url})}"
+    if not PREFETCH:
+        return url
+    data = get_preview_cache().get(url)
+    return url if data is None else data
@@ -0,0 +1,115 @@
+"""Mood → playlist recommendations as plain data.
+
+The Streamlit apps, the benchmarks and any other caller get the same
+``Recommendation`` objects; rendering lives in ``moodmusic.ui``.
+``stream_recommendation`` hands them out as results arrive so a page can
+show the playlists before their tracks have loaded.
+"""
+
+from dataclasses import dataclass, field
+
+from moodmusic.catalog import iter_playlist_tracks, search_playlists
+from moodmusic.moods import genre_for_mood
+
+
+@dataclass
+class Track:
+    name: str
+    artists: str
+    preview_url: str = None
+
+
+@dataclass
+class Playlist:
+    id: str
+    name: str
+    url: str
+    image_url: str = None
+    tracks: list = field(default_factory=list)
+
+
+@dataclass
+class Recommendation:
+    mood: str
+    genre: str
+    playlists: list = field(default_factory=list)
+
+
+def parse_playlist(item):
+    """Build a ``Playlist`` from a Spotify search item (``None`` for empty items)."""
+    if not item:
+        return None
+    images = item.get("images") or []
+    return Playlist(
+        id=item.get("id"),
+        name=item.get("name", "Unnamed Playlist"),
+        url=item.get("external_urls", {}).get("spotify", "#"),
+        image_url=images[0].get("url") if images and images[0] else None,
+    )
+
+
+def parse_tracks(response):
+    tracks = []
+    for item in (response or {}).get("items", []):
+        track = (item or {}).get("track")
+        if not track:
+            continue
+        tracks.append(Track(
+            name=track.get("name", "Unknown Track"),
+            artists=", ".join(a["name"] for a in track.get("artists", [])),
+            preview_url=track.get("preview_url"),
+        ))
+    return tracks
+
+
+def _build(mood, genre, items, track_responses):
+    recommendation = Recommendation(mood=mood, genre=genre)
+    for item, tracks in zip(items, track_responses):
+        playlist = parse_playlist(item)
+        if playlist is None:
+            continue
+        playlist.tracks = parse_tracks(tracks)
+        recommendation.playlists.append(playlist)
+    return recommendation
+
+
+def stream_recommendation(sp, mood, playlist_limit=3, track_limit=3):
+    """Yield ``(recommendation, index)`` updates for ``mood``.
+
+    The first update has ``index=None`` and comes as soon as the playlist
+    search returns: every playlist is listed, none has its tracks yet.
+    Each later update means ``recommendation.playlists[index]`` just got
+    its tracks; they arrive in completion order, not playlist order. With
+    ``track_limit=0`` only the playlists are listed.
+    """
+    genre = genre_for_mood(mood)
+    results = search_playlists(sp, genre, limit=playlist_limit)
+    items = [item for item in (results or {}).get("playlists", {}).get("items", []) if item]
+    playlists = [parse_playlist(item) for item in items]
+    recommendation = Recommendation(mood=mood, genre=genre, playlists=playlists)
+    yield recommendation, None
+    if not track_limit:
+        return
+
+    for i, response in iter_playlist_tracks(sp, items, limit=track_limit):
+        recommendation.playlists[i].tracks = parse_tracks(response)
+        yield recommendation, i
+
+
+def recommend(sp, mood, playlist_limit=3, track_limit=3):
+    """Search playlists for ``mood``'s genre and fetch their first tracks."""
+    for recommendation, _ in stream_recommendation(sp, mood, playlist_limit, track_limit):
+        pass
+    return recommendation
+
+
+def recommend_offline(mood, index, playlist_limit=3, track_limit=3):
+    """Same as ``recommend`` but served from a local ``TrackIndex``."""
+    genre, results = index.recommend(mood, limit=playlist_limit, track_limit=track_limit)
+    return _build(mood, genre, [p for p, _ in results], [t for _, t in results])
+
+
+def recommend_point_offline(mood, point, index, playlist_limit=3, track_limit=3):
+    """Like ``recommend_offline`` but ranked by distance to a ``(valence, energy)`` point."""
+    genre, results = index.recommend_point(point, limit=playlist_limit, track_limit=track_limit)
+    return _build(mood, genre, [p for p, _ in results], [t for _, t in results])
@@ -0,0 +1,235 @@
+"""Rate-limit-aware scheduler for Spotify API calls.
+
+Every catalog request goes through one process-wide queue instead of
+hitting the API straight from the Streamlit thread:
+
+* a token bucket caps the request rate before Spotify has to say no;
+* a 429 pauses all calls for the ``Retry-After`` the API asked for, and
+  the throttled call is retried with jittered backoff, as are 5xx and
+  connection errors;
+* user-facing calls are served before background refreshes (run a block
+  under ``with background():`` to mark its calls as background work).
+
+Calls made with ``timeout=`` never block their caller for longer: when a
+``Retry-After`` pause or a retry would end past the deadline they fail
+straight away, with the 429 that caused it or ``TimeoutError``. Only
+calls without a deadline (background refreshes, store warming) wait out
+long pauses; ``moodmusic.catalog`` gives interactive calls
+``INTERACTIVE_TIMEOUT`` seconds (``MOODMUSIC_SPOTIFY_TIMEOUT``).
+
+Identical concurrent requests are combined before they get here, by
+``moodmusic.singleflight`` in ``moodmusic.catalog``.
+
+Spotify enforces its limit over a rolling 30-second window and does not
+publish the number (it depends on the app's quota mode), so the bucket is
+only a guard against runaway bursts and the 429 handling above is what
+actually keeps the app inside the limit. The defaults, 25 requests/s with
+bursts of 100, let a cold page (one search plus a track listing per
+playlist) go out without queueing. Set ``MOODMUSIC_SPOTIFY_RATE`` /
+``MOODMUSIC_SPOTIFY_BURST`` lower for a development-mode app that sees
+frequent 429s, or higher for an extended-quota one.
+"""
+
+import concurrent.futures
+import contextlib
+import contextvars
+import itertools
+import logging
+import os
+import queue
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = 0
+BACKGROUND = 1
+
+RATE = float(os.environ.get("MOODMUSIC_SPOTIFY_RATE", "25"))
+BURST = int(os.environ.get("MOODMUSIC_SPOTIFY_BURST", "100"))
+INTERACTIVE_TIMEOUT = float(os.environ.get("MOODMUSIC_SPOTIFY_TIMEOUT", "5"))
+
+_priority = contextvars.ContextVar("spotify_priority", default=INTERACTIVE)
+
+
+def current_priority():
+    return _priority.get()
+
+
+@contextlib.contextmanager
+def background():
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class TokenBucket:
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def _retry_after(error):
+    headers = getattr(error, "headers", None) or {}
+    try:
+        return float(headers.get("Retry-After", 1))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def throttled_for(error):
+    """Seconds to wait before retrying after ``error``, or ``None`` if Spotify was not throttling.
+
+    Covers a 429 from the API and the ``TimeoutError`` of a call that gave
+    up on its deadline (see ``SpotifyScheduler.submit``).
+    """
+    if getattr(error, "http_status", None) == 429:
+        return _retry_after(error)
+    if isinstance(error, TimeoutError):
+        return max(1.0, get_scheduler().metrics()["paused_for"])
+    return None
+
+
+def _is_retryable(error):
+    import requests
+    import spotipy
+
+    if isinstance(error, spotipy.SpotifyException):
+        return error.http_status == 429 or error.http_status >= 500
+    return isinstance(error, (requests.ConnectionError, requests.Timeout))
+
+
+class SpotifyScheduler:
+    def __init__(self, rate=RATE, burst=BURST, workers=8, max_retries=4,
+                 base_backoff=0.5, max_backoff=30.0):
+        self.bucket = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._paused_until = 0.0
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        for i in range(workers):
+            threading.Thread(target=self._run, name=f"spotify-scheduler-{i}", daemon=True).start()
+
+    def submit(self, key, fn, priority=None, timeout=None):
+        """Queue ``fn()``; ``key`` identifies the call in retry logs.
+
+        With ``timeout`` the call gives up once it could no longer finish
+        within that many seconds of now.
+        """
+        priority = _priority.get() if priority is None else priority
+        deadline = None if timeout is None else time.monotonic() + timeout
+        future = concurrent.futures.Future()
+        if deadline is not None and self._paused_until > deadline:
+            future.set_exception(self._paused_error(key))
+            return future
+        self._enqueue(priority, key, fn, future, 0, deadline)
+        return future
+
+    def call(self, key, fn, priority=None, timeout=None):
+        return self.submit(key, fn, priority, timeout).result(timeout=timeout)
+
+    def _enqueue(self, priority, key, fn, future, attempt, deadline):
+        self._queue.put((priority, next(self._sequence), key, fn, future, attempt, deadline))
+
+    def _paused_error(self, key):
+        pause = self._paused_until - time.monotonic()
+        return TimeoutError(f"Spotify rate limit: {key} would wait {pause:.0f}s for Retry-After")
+
+    def _backoff(self, attempt):
+        # "Full jitter": spread retries so throttled callers do not return in lockstep.
+        return random.uniform(0, min(self.max_backoff, self.base_backoff * 2 ** attempt))
+
+    def _run(self):
+        while True:
+            priority, _, key, fn, future, attempt, deadline = self._queue.get()
+
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                future.set_exception(TimeoutError(f"{key} timed out waiting for the scheduler"))
+                continue
+            pause = self._paused_until - now
+            if pause > 0:
+                if deadline is not None and now + pause > deadline:
+                    future.set_exception(self._paused_error(key))
+                    continue
+                time.sleep(pause)
+            self.bucket.acquire()
+
+            try:
+                with self._lock:
+                    self.calls += 1
+                result = fn()
+            except Exception as e:
+                if attempt < self.max_retries and _is_retryable(e):
+                    self._schedule_retry(e, priority, key, fn, future, attempt, deadline)
+                else:
+                    future.set_exception(e)
+                continue
+            future.set_result(result)
+
+    def _schedule_retry(self, error, priority, key, fn, future, attempt, deadline):
+        delay = self._backoff(attempt)
+        if getattr(error, "http_status", None) == 429:
+            retry_after = _retry_after(error)
+            with self._lock:
+                self.throttled += 1
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            delay += retry_after
+        if deadline is not None and time.monotonic() + delay > deadline:
+            logger.info("Not retrying %s: %.2fs wait is past its deadline (%s)", key, delay, error)
+            future.set_exception(error)
+            return
+        with self._lock:
+            self.retries += 1
+        logger.info("Retrying %s in %.2fs after %s", key, delay, error)
+        timer = threading.Timer(
+            delay, self._enqueue, args=(priority, key, fn, future, attempt + 1, deadline)
+        )
+        timer.daemon = True
+        timer.start()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                "queue_depth": self._queue.qsize(),
+                "calls": self.calls,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = SpotifyScheduler()
+        return _scheduler
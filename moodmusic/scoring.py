@@ -0,0 +1,106 @@
+"""Continuous mood scoring on the valence/energy plane.
+
+The text apps collapse TextBlob polarity into Happy/Sad/Neutral and then
+into one genre, so every "Happy" user gets the same playlists. Here a text
+becomes a ``(valence, energy)`` point:
+
+* valence is polarity rescaled from [-1, 1] to [0, 1];
+* energy starts low and rises with how strongly and subjectively the
+  sentiment is expressed, with exclamation marks and shouted words.
+
+Tracks carry the same two audio features (see ``moodmusic.index``) and are
+ranked by squared distance to the point over precomputed NumPy columns.
+
+    python -m moodmusic.scoring "I'm SO excited for tonight!!"
+    python -m moodmusic.scoring --bench --tracks 20000
+"""
+
+import re
+
+import numpy as np
+
+from moodmusic.cache import TTLCache
+
+_WORD = re.compile(r"[^\W\d_]{2,}")
+
+point_cache = TTLCache(maxsize=4096, ttl=60 * 60)
+
+
+def energy_from_text(text, polarity, subjectivity):
+    exclamations = min(text.count("!"), 3) / 3
+    words = _WORD.findall(text)
+    shouting = sum(word.isupper() for word in words) / len(words) if words else 0.0
+    energy = (
+        0.25
+        + 0.35 * abs(polarity) * (0.5 + 0.5 * subjectivity)
+        + 0.25 * exclamations
+        + 0.15 * shouting
+    )
+    return float(np.clip(energy, 0.0, 1.0))
+
+
+def text_point(text):
+    """``(valence, energy)`` for ``text`` as a float32 array."""
+
+    def compute():
+        from textblob import TextBlob
+
+        sentiment = TextBlob(text).sentiment
+        valence = (sentiment.polarity + 1) / 2
+        energy = energy_from_text(text, sentiment.polarity, sentiment.subjectivity)
+        return np.array([valence, energy], dtype=np.float32)
+
+    # Keyed on the raw text: casing and "!" feed the energy.
+    return point_cache.get_or_load(text, compute)
+
+
+def rank(valence, energy, point, k):
+    """Indices of the ``k`` tracks closest to ``point``, nearest first.
+
+    ``valence`` and ``energy`` are contiguous float32 columns; two 1-D
+    passes are an order of magnitude faster than reducing an (n, 2) array.
+    """
+    n = len(valence)
+    if n == 0 or k <= 0:
+        return np.zeros(0, dtype=np.intp)
+    dv = valence - point[0]
+    de = energy - point[1]
+    distances = dv * dv + de * de
+    if k < n:
+        candidates = np.argpartition(distances, k)[:k]
+    else:
+        candidates = np.arange(n)
+    return candidates[np.argsort(distances[candidates], kind="stable")]
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from moodmusic.loadtest import percentile
+
+    parser = argparse.ArgumentParser(description="Score text on the valence/energy plane.")
+    parser.add_argument("text", nargs="*")
+    parser.add_argument("--bench", action="store_true", help="time ranking over a synthetic catalog")
+    parser.add_argument("--tracks", type=int, default=10000)
+    parser.add_argument("--k", type=int, default=72)
+    parser.add_argument("--repeats", type=int, default=2000)
+    args = parser.parse_args()
+
+    for text in args.text:
+        valence, energy = text_point(text)
+        print(f"{text!r}: valence {valence:.2f}, energy {energy:.2f}")
+
+    if args.bench:
+        rng = np.random.default_rng(0)
+        valence = rng.random(args.tracks, dtype=np.float32)
+        energy = rng.random(args.tracks, dtype=np.float32)
+        points = rng.random((args.repeats, 2), dtype=np.float32)
+        timings = []
+        for point in points:
+            start = time.perf_counter()
+            rank(valence, energy, point, args.k)
+            timings.append((time.perf_counter() - start) * 1e6)
+        timings.sort()
+        print(f"rank {args.k} of {args.tracks} tracks: p50 {percentile(timings, 50):.0f} µs, "
+              f"p99 {percentile(timings, 99):.0f} µs")
@@ -0,0 +1,83 @@
+"""Single-flight: concurrent identical calls share one execution.
+
+When a burst of sessions land on the same mood they all miss the catalog
+cache at once and would each fire the same ``sp.search`` and
+``playlist_tracks`` calls. ``SingleFlight.do(key, fn)`` runs ``fn`` for the
+first caller of ``key``; everyone who asks for ``key`` while it is running
+waits for that call and gets its result (or its exception).
+
+Nothing is cached here: once the call finishes the next ``do`` for the key
+runs ``fn`` again. Put it in front of a cache, not instead of one.
+"""
+
+import concurrent.futures
+import threading
+from collections import OrderedDict
+
+# Per-key counts are kept for this many most recently used keys (one per
+# playlist id in the catalog); totals are always exact.
+MAX_TRACKED_KEYS = 1024
+
+
+class SingleFlight:
+    def __init__(self, max_tracked_keys=MAX_TRACKED_KEYS):
+        self.max_tracked_keys = max_tracked_keys
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._keys = OrderedDict()
+        self.calls = 0
+        self.shared = 0
+
+    def _count(self, key, leader):
+        # Called with the lock held.
+        counts = self._keys.pop(key, None) or [0, 0]
+        counts[0 if leader else 1] += 1
+        self._keys[key] = counts
+        if len(self._keys) > self.max_tracked_keys:
+            self._keys.popitem(last=False)
+        if leader:
+            self.calls += 1
+        else:
+            self.shared += 1
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = concurrent.futures.Future()
+            self._count(key, leader)
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self, top=10):
+        """Totals plus the ``top`` tracked keys with the most shared calls."""
+        with self._lock:
+            busiest = sorted(self._keys.items(), key=lambda item: item[1][1], reverse=True)[:top]
+            total = self.calls + self.shared
+            return {
+                "in_flight": len(self._inflight),
+                "calls": self.calls,
+                "shared": self.shared,
+                "shared_rate": self.shared / total if total else 0.0,
+                "keys": {
+                    "|".join(map(str, key)) if isinstance(key, tuple) else str(key): {
+                        "calls": calls,
+                        "shared": shared,
+                    }
+                    for key, (calls, shared) in busiest
+                    if shared
+                },
+            }
@@ -0,0 +1,87 @@
+"""Process-wide, pooled Spotify clients.
+
+Each Streamlit rerun used to build a fresh ``spotipy.Spotify`` with its own
+client-credentials exchange and its own HTTP connections. Clients created
+here are cached per credential pair and share one keep-alive session, and
+their access token is fetched once and refreshed shortly before expiry.
+
+Set ``MOODMUSIC_SPOTIFY_API`` (e.g. ``http://127.0.0.1:8999``) to send all
+API and token requests to a local stand-in such as ``moodmusic.fake_spotify``.
+"""
+
+import os
+import threading
+
+import requests
+import spotipy
+from requests.adapters import HTTPAdapter
+from spotipy.cache_handler import MemoryCacheHandler
+from spotipy.oauth2 import SpotifyClientCredentials
+
+POOL_SIZE = 32
+REQUESTS_TIMEOUT = 10
+API_BASE = os.environ.get("MOODMUSIC_SPOTIFY_API")
+
+_lock = threading.Lock()
+_session = None
+_clients = {}
+
+
+def _shared_session():
+    global _session
+    if _session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        _session = session
+    return _session
+
+
+class SharedClientCredentials(SpotifyClientCredentials):
+    # spotipy already treats a token as expired 60s before ``expires_at``,
+    # so cached tokens are refreshed ahead of time. The lock makes sure
+    # concurrent sessions wait for one refresh instead of each running
+    # their own token exchange.
+    def __init__(self, client_id, client_secret, requests_session, api_base=None):
+        super().__init__(
+            client_id=client_id,
+            client_secret=client_secret,
+            cache_handler=MemoryCacheHandler(),
+            requests_session=requests_session,
+        )
+        if api_base:
+            self.OAUTH_TOKEN_URL = f"{api_base.rstrip('/')}/api/token"
+        self._token_lock = threading.Lock()
+
+    def get_access_token(self, as_dict=True, check_cache=True):
+        with self._token_lock:
+            return super().get_access_token(as_dict=as_dict, check_cache=check_cache)
+
+
+def get_spotify_client(client_id, client_secret, api_base=None):
+    """Return the shared Spotify client for these credentials."""
+    api_base = api_base or API_BASE
+    key = (client_id, client_secret, api_base)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            session = _shared_session()
+            client = spotipy.Spotify(
+                auth_manager=SharedClientCredentials(client_id, client_secret, session, api_base),
+                requests_session=session,
+                requests_timeout=REQUESTS_TIMEOUT,
+            )
+            if api_base:
+                client.prefix = f"{api_base.rstrip('/')}/v1/"
+            _clients[key] = client
+    return client
+
+
+def clear_clients():
+    with _lock:
+        _clients.clear()
@@ -0,0 +1,195 @@
+"""Persistent SQLite cache of Spotify catalog responses.
+
+Playlist search results and playlist tracks are stored as JSON keyed by
+query / playlist id, so a restarted server answers from disk instead of
+paying full API latency and rate-limit quota. Reads are
+stale-while-revalidate: entries older than ``fresh_for`` are still served
+(up to ``max_stale``) while a background refresh replaces them.
+
+Prefetch every genre before traffic arrives with::
+
+    python -m moodmusic.store warm --client-id ... --client-secret ...
+
+(credentials default to the ``SPOTIPY_CLIENT_ID`` / ``SPOTIPY_CLIENT_SECRET``
+environment variables).
+"""
+
+import concurrent.futures
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = os.environ.get(
+    "MOODMUSIC_CATALOG_DB",
+    os.path.join(os.path.expanduser("~"), ".cache", "moodmusic", "catalog.sqlite3"),
+)
+FRESH_FOR = 6 * 60 * 60
+MAX_STALE = 7 * 24 * 60 * 60
+
+
+class CatalogStore:
+    def __init__(self, path=DEFAULT_PATH, fresh_for=FRESH_FOR, max_stale=MAX_STALE):
+        self.path = path
+        self.fresh_for = fresh_for
+        self.max_stale = max_stale
+        self._lock = threading.Lock()
+        self._conn = None
+        self._refreshing = set()
+        self._refresher = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="catalog-refresh"
+        )
+
+    def _connect(self):
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS catalog ("
+                " kind TEXT NOT NULL,"
+                " key TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " PRIMARY KEY (kind, key))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, kind, key):
+        """Return ``(payload, age_seconds)`` or ``(None, None)`` if absent."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT payload, fetched_at FROM catalog WHERE kind = ? AND key = ?",
+                (kind, key),
+            ).fetchone()
+        if row is None:
+            return None, None
+        payload, fetched_at = row
+        return json.loads(payload), time.time() - fetched_at
+
+    def put(self, kind, key, payload):
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO catalog (kind, key, payload, fetched_at)"
+                " VALUES (?, ?, ?, ?)",
+                (kind, key, json.dumps(payload), time.time()),
+            )
+            conn.commit()
+
+    def read_through(self, kind, key, loader):
+        """Serve ``(kind, key)`` from disk, falling back to ``loader()``.
+
+        Returns ``(payload, stale)``. Fresh entries are returned as-is.
+        Stale entries are returned immediately, with ``stale=True``, and
+        refreshed in the background; callers caching them should only do
+        so briefly. Missing or expired entries are loaded synchronously
+        and stored.
+        """
+        payload, age = self.get(kind, key)
+        if payload is not None and age <= self.fresh_for:
+            return payload, False
+        if payload is not None and age <= self.max_stale:
+            self._refresh_in_background(kind, key, loader)
+            return payload, True
+
+        payload = loader()
+        if payload is not None:
+            self.put(kind, key, payload)
+        return payload, False
+
+    def _refresh_in_background(self, kind, key, loader):
+        with self._lock:
+            if (kind, key) in self._refreshing:
+                return
+            self._refreshing.add((kind, key))
+        self._refresher.submit(self._refresh, kind, key, loader)
+
+    def _refresh(self, kind, key, loader):
+        from moodmusic.scheduler import background
+
+        try:
+            with background():
+                payload = loader()
+            if payload is not None:
+                self.put(kind, key, payload)
+        except Exception:
+            logger.exception("Background refresh of %s %s failed", kind, key)
+        finally:
+            with self._lock:
+                self._refreshing.discard((kind, key))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_store():
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = CatalogStore()
+        return _default_store
+
+
+def warm(sp, store, search_limits=(3, 5), track_limit=3):
+    """Fetch every genre's playlists and their tracks into ``store``.
+
+    Calls go through the catalog's rate-limited scheduler as background
+    work, so warming waits out 429 pauses instead of failing.
+    """
+    from moodmusic.catalog import _playlist_tracks, _search, api_scope
+    from moodmusic.moods import all_genres
+    from moodmusic.scheduler import background
+
+    scope = api_scope(sp)
+    playlist_ids = set()
+    with background():
+        for genre in all_genres():
+            for limit in search_limits:
+                results = _search(sp, genre, limit)
+                store.put("search", f"{scope}{genre}|{limit}", results)
+                items = (results or {}).get("playlists", {}).get("items", [])
+                playlist_ids.update(item["id"] for item in items if item and item.get("id"))
+            logger.info("Warmed searches for %s", genre)
+
+        for playlist_id in sorted(playlist_ids):
+            store.put("tracks", f"{scope}{playlist_id}|{track_limit}",
+                      _playlist_tracks(sp, playlist_id, track_limit))
+    logger.info("Warmed tracks for %d playlists", len(playlist_ids))
+    return len(playlist_ids)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the on-disk Spotify catalog cache.")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    warm_parser = subcommands.add_parser("warm", help="prefetch every mood genre")
+    warm_parser.add_argument("--client-id", default=os.environ.get("SPOTIPY_CLIENT_ID"))
+    warm_parser.add_argument("--client-secret", default=os.environ.get("SPOTIPY_CLIENT_SECRET"))
+    warm_parser.add_argument("--db", default=DEFAULT_PATH)
+    args = parser.parse_args()
+
+    if not args.client_id or not args.client_secret:
+        parser.error("Spotify credentials are required (--client-id/--client-secret)")
+
+    from moodmusic.spotify import get_spotify_client
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    start = time.perf_counter()
+    count = warm(get_spotify_client(args.client_id, args.client_secret), CatalogStore(args.db))
+    print(f"Warmed {count} playlists into {args.db} in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,121 @@
+"""Batch TextBlob mood classification.
+
+Scores many strings per call with the same rule the text apps use
+(polarity > 0.2 → Happy, < -0.2 → Sad, otherwise Neutral) and returns
+NumPy arrays. Duplicate strings are scored once, and large batches can be
+spread over worker processes.
+
+Backfill a log file from the command line::
+
+    python -m moodmusic.text_mood inputs.jsonl --field text --out labelled.jsonl
+    python -m moodmusic.text_mood inputs.csv --field message --workers 4
+"""
+
+import concurrent.futures
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from moodmusic.moods import HAPPY_THRESHOLD, SAD_THRESHOLD
+
+MOODS = np.array(["Happy", "Sad", "Neutral"])
+
+_analyzer = None
+
+
+def _polarity(texts):
+    global _analyzer
+    if _analyzer is None:
+        from textblob.sentiments import PatternAnalyzer
+
+        _analyzer = PatternAnalyzer()
+    # Same scorer TextBlob(text).sentiment uses, without building a Blob
+    # (tokenizer, parser setup) for every string.
+    return [_analyzer.analyze(text).polarity for text in texts]
+
+
+def moods_from_polarity(polarity):
+    """Map a polarity array to mood labels with the apps' ±0.2 thresholds."""
+    polarity = np.asarray(polarity)
+    codes = np.full(polarity.shape, 2, dtype=np.int8)
+    codes[polarity > HAPPY_THRESHOLD] = 0
+    codes[polarity < SAD_THRESHOLD] = 1
+    return MOODS[codes]
+
+
+def classify_batch(texts, workers=1, chunk_size=2000):
+    """Return ``(moods, polarity)`` arrays for ``texts``."""
+    texts = ["" if text is None else str(text) for text in texts]
+    if not texts:
+        return MOODS[:0], np.zeros(0, dtype=np.float32)
+
+    unique, inverse = np.unique(np.array(texts, dtype=object), return_inverse=True)
+    unique = unique.tolist()
+
+    if workers > 1 and len(unique) > chunk_size:
+        chunks = [unique[i:i + chunk_size] for i in range(0, len(unique), chunk_size)]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            scores = [score for chunk in pool.map(_polarity, chunks) for score in chunk]
+    else:
+        scores = _polarity(unique)
+
+    # Threshold at full precision so labels match the apps exactly.
+    polarity = np.asarray(scores, dtype=np.float64)[inverse]
+    return moods_from_polarity(polarity), polarity.astype(np.float32)
+
+
+# ------------------------------
+# 📂 FILE I/O
+# ------------------------------
+def _read_rows(path, field):
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+    else:
+        with open(path, encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f if line.strip()]
+    return rows, [row.get(field) for row in rows]
+
+
+def _write_rows(rows, out, path_hint):
+    if path_hint.endswith(".csv"):
+        writer = csv.DictWriter(out, fieldnames=list(rows[0].keys()) if rows else [])
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + "\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Label a JSONL/CSV file with text moods.")
+    parser.add_argument("path", help="input .jsonl or .csv file")
+    parser.add_argument("--field", default="text", help="column holding the user text")
+    parser.add_argument("--out", help="output file (defaults to stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    rows, texts = _read_rows(args.path, args.field)
+    start = time.perf_counter()
+    moods, polarity = classify_batch(texts, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    for row, mood, score in zip(rows, moods.tolist(), polarity.tolist()):
+        row["mood"] = mood
+        row["polarity"] = round(score, 4)
+
+    out_hint = args.out or args.path
+    if args.out:
+        with open(args.out, "w", newline="", encoding="utf-8") as out:
+            _write_rows(rows, out, out_hint)
+    else:
+        _write_rows(rows, sys.stdout, out_hint)
+
+    rate = len(texts) / elapsed if elapsed > 0 else float("inf")
+    print(f"Classified {len(texts)} texts in {elapsed:.2f}s ({rate:,.0f} texts/s)", file=sys.stderr)
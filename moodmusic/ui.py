@@ -0,0 +1,246 @@
+"""Streamlit rendering helpers shared by the app entry points."""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+
+import spotipy
+import streamlit as st
+
+from moodmusic.artwork import artwork_src
+from moodmusic.credentials import read_spotify_credentials
+from moodmusic.index import get_index
+from moodmusic.loadtest import percentile
+from moodmusic.moods import genre_for_mood
+from moodmusic.previews import prefetch_previews, preview_src
+from moodmusic.recommend import recommend, recommend_offline, stream_recommendation
+from moodmusic.scheduler import throttled_for
+from moodmusic.spotify import get_spotify_client
+
+MOOD_GRADIENTS = {
+    "Happy": "linear-gradient(270deg, #fce38a, #f38181, #fce38a)",
+    "Sad": "linear-gradient(270deg, #89f7fe, #66a6ff, #89f7fe)",
+    "Neutral": "linear-gradient(270deg, #d3cce3, #e9e4f0, #d3cce3)",
+}
+DEFAULT_GRADIENT = MOOD_GRADIENTS["Neutral"]
+
+logger = logging.getLogger(__name__)
+
+# Set MOODMUSIC_DEBUG=1 to show the page timings below the results.
+DEBUG = os.environ.get("MOODMUSIC_DEBUG", "0") == "1"
+
+# Recent page timings (ms) across all sessions of this server process.
+_timings = {"first_playlist_ms": deque(maxlen=500), "total_ms": deque(maxlen=500)}
+_timings_lock = threading.Lock()
+
+_MOOD_BOX_CSS = """
+<style>
+@keyframes pulse-bg {
+    0% {background-position: 0% 50%;}
+    50% {background-position: 100% 50%;}
+    100% {background-position: 0% 50%;}
+}
+
+.mood-box {
+    color: white;
+    border-radius: 1rem;
+    padding: 1.2rem;
+    text-align: center;
+    animation: pulse-bg 8s ease infinite;
+    background-size: 300% 300%;
+    box-shadow: 0 4px 20px rgba(0,0,0,0.2);
+}
+</style>
+"""
+
+
+def page_setup(subtitle):
+    st.set_page_config(page_title="Mood Music Recommender", page_icon="🎵", layout="centered")
+    st.markdown(_MOOD_BOX_CSS, unsafe_allow_html=True)
+    st.title("🎧 Mood-Based Music Recommender")
+    st.markdown(subtitle)
+
+
+def render_mood(mood):
+    gradient = MOOD_GRADIENTS.get(mood, DEFAULT_GRADIENT)
+    st.markdown(
+        f"""
+        <div class="mood-box" style="background:{gradient};">
+            <h3>Detected mood: <b>{mood}</b></h3>
+        </div>
+        """,
+        unsafe_allow_html=True,
+    )
+
+
+def spotify_credentials():
+    """Credentials from secrets/env, or from a testing-only expander; stops the run if missing."""
+    client_id = client_secret = None
+    try:
+        client_id, client_secret = read_spotify_credentials(st.secrets)
+    except Exception as e:
+        st.warning(f"⚠️ Could not load Streamlit secrets: {e}")
+        client_id, client_secret = read_spotify_credentials()
+
+    if not client_id or not client_secret:
+        with st.expander("🔑 Enter Spotify Credentials (for testing only)"):
+            client_id = st.text_input("Spotify Client ID", type="password")
+            client_secret = st.text_input("Spotify Client Secret", type="password")
+
+    if not client_id or not client_secret:
+        st.stop()
+    return client_id, client_secret
+
+
+def _render_playlist_header(playlist, image_width):
+    st.subheader(f"🎶 [{playlist.name}]({playlist.url})")
+    if playlist.image_url:
+        st.image(artwork_src(playlist.image_url, image_width), width=image_width)
+
+
+def render_playlist(playlist, image_width=280, tracks=True):
+    _render_playlist_header(playlist, image_width)
+    if not tracks:
+        st.write("---")
+        return
+
+    if not playlist.tracks:
+        st.caption("No tracks found in this playlist.")
+    for track in playlist.tracks:
+        st.markdown(f"**{track.name}** — {track.artists}")
+        if track.preview_url:
+            st.audio(preview_src(track.preview_url), format="audio/mp3")
+        else:
+            st.caption("🔇 No preview available.")
+    st.write("---")
+
+
+def render_recommendation(recommendation, image_width=280, tracks=True):
+    if not recommendation.playlists:
+        st.warning("😕 No playlists found for this genre.")
+        return
+    for playlist in recommendation.playlists:
+        render_playlist(playlist, image_width, tracks)
+
+
+def _record_timing(name, started):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _timings_lock:
+        _timings[name].append(elapsed_ms)
+    return elapsed_ms
+
+
+def render_stream(updates, started, image_width=280):
+    """Render ``stream_recommendation`` updates as they arrive.
+
+    Each playlist gets a placeholder that shows its header while its tracks
+    load and is filled in when they arrive. ``started`` is the
+    ``time.perf_counter()`` at the start of the script run; time to the
+    first playlist and total page time are recorded separately (see
+    ``page_timings``). Returns the final ``Recommendation``.
+    """
+    status = st.empty()
+    status.caption("🔍 Searching Spotify for playlists…")
+    slots = []
+    recommendation = None
+    for recommendation, index in updates:
+        if index is not None:
+            with slots[index].container():
+                render_playlist(recommendation.playlists[index], image_width)
+            continue
+
+        status.empty()
+        if not recommendation.playlists:
+            st.warning("😕 No playlists found for this genre.")
+            break
+        for playlist in recommendation.playlists:
+            slot = st.empty()
+            with slot.container():
+                _render_playlist_header(playlist, image_width)
+                st.caption("⏳ Loading tracks…")
+            slots.append(slot)
+        first_ms = _record_timing("first_playlist_ms", started)
+
+    if recommendation is not None and recommendation.playlists:
+        total_ms = _record_timing("total_ms", started)
+        logger.info("First playlist after %.0f ms, page complete after %.0f ms", first_ms, total_ms)
+    return recommendation
+
+
+def render_for_mood(mood, started, playlist_limit=3, track_limit=3, image_width=280):
+    """Render ``mood``'s playlists from the offline index, or stream them from Spotify.
+
+    Without an index (see ``moodmusic.index``) credentials are asked for
+    and the live catalog is used. ``track_limit=0`` lists the playlists
+    without their tracks. Spotify errors are shown on the page instead of
+    raised.
+    """
+    index = get_index()
+    if index is not None:
+        st.info(f"🎧 {genre_for_mood(mood).capitalize()} playlists for your *{mood}* mood")
+        recommendation = recommend_offline(mood, index, playlist_limit, track_limit)
+        render_recommendation(recommendation, image_width, tracks=bool(track_limit))
+        for name in ("first_playlist_ms", "total_ms"):
+            _record_timing(name, started)
+        return
+
+    client_id, client_secret = spotify_credentials()
+
+    try:
+        sp = get_spotify_client(client_id, client_secret)
+        st.info(f"🎧 {genre_for_mood(mood).capitalize()} playlists for your *{mood}* mood")
+        if not track_limit:
+            render_recommendation(recommend(sp, mood, playlist_limit, 0), image_width, tracks=False)
+            return
+        # Playlists show up as soon as the search returns; each one's tracks
+        # fill in as their request completes.
+        recommendation = render_stream(
+            stream_recommendation(sp, mood, playlist_limit, track_limit), started, image_width
+        )
+        # Download the top preview clips in the background. This run already
+        # handed st.audio the remote URLs, so only the next rerun plays them
+        # from the local cache; a no-op unless enabled.
+        prefetch_previews(recommendation.playlists)
+
+    except Exception as e:
+        _render_error(e)
+
+
+def _render_error(error):
+    retry_after = throttled_for(error)
+    if retry_after is not None:
+        st.warning(f"⏳ Spotify is busy right now, retry in {math.ceil(retry_after)} s.")
+    elif isinstance(error, spotipy.SpotifyException):
+        st.error("🚨 Spotify authentication failed.")
+        st.code(str(error))
+    else:
+        st.error("❌ Unexpected error occurred.")
+        st.code(str(error))
+
+
+def page_timings():
+    """p50/p95 of the recorded time-to-first-playlist and total page times."""
+    stats = {}
+    with _timings_lock:
+        samples = {name: sorted(values) for name, values in _timings.items()}
+    for name, values in samples.items():
+        if not values:
+            stats[name] = {"count": 0}
+            continue
+        stats[name] = {
+            "count": len(values),
+            "p50": percentile(values, 50),
+            "p95": percentile(values, 95),
+        }
+    return stats
+
+
+def render_debug():
+    """Page timings in an expander, when ``MOODMUSIC_DEBUG=1``."""
+    if not DEBUG:
+        return
+    with st.expander("⏱️ Page timings (ms, this server process)"):
+        st.json(page_timings())
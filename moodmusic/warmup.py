@@ -0,0 +1,125 @@
+"""Warm-start DeepFace so the first selfie does not pay for model loading.
+
+DeepFace builds its face detector and emotion CNN lazily and caches them
+in module-level state. Building them (and optionally running one dummy
+inference to trigger graph compilation) before the first real request
+moves that cost off the user's critical path.
+
+Run ``python -m moodmusic.warmup`` to download the weights and print the
+per-model load times, e.g. as a deploy step to track cold-start cost.
+"""
+
+import logging
+import threading
+import time
+
+from moodmusic.detectors import DEFAULT_BACKEND
+from moodmusic.models import registry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DETECTOR_BACKEND = DEFAULT_BACKEND
+
+_warmup_lock = threading.Lock()
+_warmup_thread = None
+_last_timings = {}
+
+
+def _build_deepface_model(task, model_name):
+    # The model-building entry point moved between deepface releases.
+    try:
+        from deepface.modules import modeling
+
+        return modeling.build_model(task=task, model_name=model_name)
+    except (ImportError, TypeError):
+        pass
+
+    if task == "face_detector":
+        from deepface.detectors import FaceDetector
+
+        return FaceDetector.build_model(model_name)
+
+    from deepface import DeepFace
+
+    return DeepFace.build_model(model_name)
+
+
+def _register_deepface_models(detector_backend):
+    registry.register(
+        "deepface_emotion",
+        lambda: _build_deepface_model("facial_attribute", "Emotion"),
+    )
+    registry.register(
+        f"deepface_detector_{detector_backend}",
+        lambda: _build_deepface_model("face_detector", detector_backend),
+    )
+
+
+def warm_up_deepface(detector_backend=DEFAULT_DETECTOR_BACKEND, dummy_inference=True):
+    """Build the DeepFace detector and emotion models; return load times in seconds."""
+    _register_deepface_models(detector_backend)
+    timings = {}
+
+    for name in ("deepface_emotion", f"deepface_detector_{detector_backend}"):
+        start = time.perf_counter()
+        registry.get(name)
+        timings[name] = time.perf_counter() - start
+        logger.info("Loaded %s in %.2fs", name, timings[name])
+
+    if dummy_inference:
+        import numpy as np
+        from deepface import DeepFace
+
+        blank = np.zeros((224, 224, 3), dtype=np.uint8)
+        start = time.perf_counter()
+        DeepFace.analyze(
+            img_path=blank,
+            actions=["emotion"],
+            enforce_detection=False,
+            detector_backend=detector_backend,
+        )
+        timings["dummy_inference"] = time.perf_counter() - start
+        logger.info("Dummy emotion inference took %.2fs", timings["dummy_inference"])
+
+    _last_timings.update(timings)
+    return timings
+
+
+def _run_warmup(detector_backend, dummy_inference):
+    try:
+        warm_up_deepface(detector_backend, dummy_inference)
+    except Exception:
+        logger.exception("DeepFace warm-up failed; models will load on first use")
+
+
+def start_warmup(detector_backend=DEFAULT_DETECTOR_BACKEND, dummy_inference=True):
+    """Start the warm-up in a background thread, at most once per process."""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            _warmup_thread = threading.Thread(
+                target=_run_warmup,
+                args=(detector_backend, dummy_inference),
+                name="deepface-warmup",
+                daemon=True,
+            )
+            _warmup_thread.start()
+        return _warmup_thread
+
+
+def last_timings():
+    return dict(_last_timings)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Preload DeepFace emotion models.")
+    parser.add_argument("--detector-backend", default=DEFAULT_DETECTOR_BACKEND)
+    parser.add_argument("--no-dummy-inference", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    results = warm_up_deepface(args.detector_backend, not args.no_dummy_inference)
+    for model_name, seconds in results.items():
+        print(f"{model_name}: {seconds:.2f}s")
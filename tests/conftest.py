@@ -0,0 +1,27 @@
+import pytest
+
+from moodmusic import catalog
+from moodmusic.fake_spotify import FakeSpotify
+from moodmusic.store import CatalogStore
+
+
+@pytest.fixture
+def fake():
+    """A running local Spotify stand-in; its base URL is ``fake.url``."""
+    fake = FakeSpotify(latency_ms=0, jitter_ms=0, seed=0)
+    fake.url = fake.start()
+    yield fake
+    fake.stop()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    """An empty catalog store in ``tmp_path`` behind empty in-memory caches."""
+    store = CatalogStore(str(tmp_path / "catalog.sqlite3"))
+    monkeypatch.setattr(catalog, "get_store", lambda: store)
+    catalog.search_cache.clear()
+    catalog.tracks_cache.clear()
+    yield store
+    catalog.search_cache.clear()
+    catalog.tracks_cache.clear()
+    store.close()
@@ -0,0 +1,50 @@
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from moodmusic import api, scheduler, spotify
+from moodmusic.index import TrackIndex
+
+CATALOG = os.path.join(os.path.dirname(__file__), os.pardir, "fixtures", "catalog.json")
+
+
+@pytest.fixture
+def client(fake, store, monkeypatch):
+    monkeypatch.setenv("SPOTIPY_CLIENT_ID", "test-id")
+    monkeypatch.setenv("SPOTIPY_CLIENT_SECRET", "test-secret")
+    monkeypatch.setattr(spotify, "API_BASE", fake.url)
+    # A throttled test must not pause the process-wide scheduler.
+    monkeypatch.setattr(scheduler, "_scheduler", scheduler.SpotifyScheduler(base_backoff=0.01))
+    monkeypatch.setattr(api, "get_index", lambda: None)
+    return TestClient(api.app)
+
+
+def test_recommend_from_spotify(client):
+    response = client.post("/recommend", json={"text": "I am so happy today"})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["mood"] == "Happy"
+    assert body["playlists"]
+
+
+def test_throttled_without_index_is_503_with_retry_after(client, fake):
+    fake.rate_429 = 1.0
+    fake.retry_after = 30
+
+    response = client.post("/recommend", json={"text": "I am so happy today"})
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_index_is_preferred_over_spotify(client, fake, monkeypatch):
+    index = TrackIndex.from_catalog_file(CATALOG)
+    monkeypatch.setattr(api, "get_index", lambda: index)
+
+    response = client.post("/recommend", json={"text": "I am so happy today"})
+
+    assert response.status_code == 200
+    assert response.json()["playlists"]
+    assert fake.requests == 0
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from moodmusic.batching import MicroBatcher
+
+
+def recording_batch_fn():
+    batches = []
+
+    def batch_fn(items):
+        batches.append(list(items))
+        return [item * 2 for item in items]
+
+    return batch_fn, batches
+
+
+def test_batches_up_to_max_batch_size():
+    batch_fn, batches = recording_batch_fn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=200)
+    futures = [batcher.submit(i) for i in range(10)]
+
+    assert [future.result(timeout=5) for future in futures] == [i * 2 for i in range(10)]
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+
+
+def test_flushes_partial_batch_after_max_wait():
+    batch_fn, batches = recording_batch_fn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=16, max_wait_ms=20)
+
+    start = time.monotonic()
+    assert batcher(3, timeout=5) == 6
+    assert time.monotonic() - start < 1.0
+    assert batches == [[3]]
+
+
+def test_wrong_result_count_fails_every_future():
+    batcher = MicroBatcher(lambda items: items[:-1], max_batch_size=3, max_wait_ms=200)
+    futures = [batcher.submit(i) for i in range(3)]
+
+    for future in futures:
+        with pytest.raises(ValueError, match="2 results for 3 items"):
+            future.result(timeout=5)
+
+
+def test_metrics_count_requests_and_batches():
+    batch_fn, _ = recording_batch_fn()
+    batcher = MicroBatcher(batch_fn, max_batch_size=2, max_wait_ms=200)
+
+    futures = [batcher.submit(i) for i in range(5)]
+    for future in futures:
+        future.result(timeout=5)
+
+    metrics = batcher.metrics()
+    assert metrics["requests"] == 5
+    assert metrics["batches"] == 3
+    assert metrics["batch_sizes"] == {1: 1, 2: 2}
+    assert metrics["mean_batch_size"] == pytest.approx(5 / 3)
+    assert metrics["queue_depth"] == 0
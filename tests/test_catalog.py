@@ -0,0 +1,96 @@
+import threading
+import time
+
+import pytest
+
+from moodmusic import catalog
+from moodmusic.spotify import get_spotify_client
+
+
+class RecordingSpotify:
+    """Stands in for a client of the real API; records calls instead of making them."""
+
+    prefix = catalog.SPOTIFY_API
+
+    def __init__(self):
+        self.calls = []
+
+    def search(self, q, type, limit):
+        self.calls.append(("search", q, limit))
+        return {"playlists": {"items": []}}
+
+    def playlist_tracks(self, playlist_id, limit):
+        self.calls.append(("playlist_tracks", playlist_id, limit))
+        return {"items": []}
+
+
+def test_stand_in_responses_stay_out_of_real_cache_keys(fake, store):
+    sp_fake = get_spotify_client("test-id", "test-secret", api_base=fake.url)
+    results = catalog.search_playlists(sp_fake, "pop", limit=3)
+    assert results["playlists"]["items"]
+
+    real = RecordingSpotify()
+    assert catalog.search_playlists(real, "pop", limit=3) == {"playlists": {"items": []}}
+    assert real.calls == [("search", "playlist pop", 3)]
+
+    # Only the stand-in's own entry is on disk; a fresh process serves it to the stand-in.
+    catalog.search_cache.clear()
+    assert catalog.search_playlists(sp_fake, "pop", limit=3) == results
+    assert fake.requests == 1
+
+
+def test_iter_playlist_tracks_caps_wait_on_stalled_api(monkeypatch):
+    release = threading.Event()
+    started = []
+
+    def stalled(sp, playlist_id, limit):
+        started.append(playlist_id)
+        release.wait()
+
+    monkeypatch.setattr(catalog, "get_playlist_tracks", stalled)
+    playlists = [{"id": f"playlist-{i}"} for i in range(catalog.MAX_WORKERS + 2)]
+
+    begin = time.monotonic()
+    results = list(catalog.iter_playlist_tracks(None, playlists, timeout=0.5))
+    elapsed = time.monotonic() - begin
+    release.set()
+
+    assert sorted(i for i, _ in results) == list(range(len(playlists)))
+    assert all(response is None for _, response in results)
+    assert elapsed < 1.5
+    # The fetches still queued behind the stalled ones were cancelled.
+    time.sleep(0.1)
+    assert len(started) == catalog.MAX_WORKERS
+
+
+def test_stale_store_entry_is_only_cached_briefly(store, monkeypatch):
+    monkeypatch.setattr(catalog, "STALE_TTL", 0.05)
+    store.put("search", "pop|3", {"playlists": {"items": ["old"]}})
+    store.fresh_for = -1
+    real = RecordingSpotify()
+
+    assert catalog.search_playlists(real, "pop", limit=3) == {"playlists": {"items": ["old"]}}
+    deadline = time.monotonic() + 5
+    while store.get("search", "pop|3")[0]["playlists"]["items"] == ["old"]:
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+    store.fresh_for = 60
+
+    time.sleep(0.1)
+    assert catalog.search_playlists(real, "pop", limit=3) == {"playlists": {"items": []}}
+    assert real.calls == [("search", "playlist pop", 3)]
+
+
+def test_warm_goes_through_scheduler(fake, store):
+    from moodmusic.scheduler import get_scheduler
+    from moodmusic.store import warm
+
+    sp_fake = get_spotify_client("test-id", "test-secret", api_base=fake.url)
+    calls = get_scheduler().metrics()["calls"]
+
+    count = warm(sp_fake, store)
+
+    assert count > 0
+    assert get_scheduler().metrics()["calls"] - calls == fake.requests
+    payload, _ = store.get("search", f"{catalog.api_scope(sp_fake)}pop|3")
+    assert payload["playlists"]["items"]
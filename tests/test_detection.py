@@ -0,0 +1,19 @@
+import pytest
+from textblob import TextBlob
+
+from moodmusic.detection import detect_text_mood, mood_cache, normalize_text
+from moodmusic.moods import mood_from_polarity
+
+
+@pytest.mark.parametrize("text", [":D", "bad day :D", ":d", "I am HAPPY", "What a TERRIBLE day"])
+def test_detect_text_mood_matches_textblob(text):
+    polarity = TextBlob(text).sentiment.polarity
+
+    assert detect_text_mood(text) == (mood_from_polarity(polarity), polarity)
+
+
+def test_text_cache_key_keeps_case():
+    mood_cache.clear()
+
+    assert detect_text_mood(":D")[0] != detect_text_mood(":d")[0]
+    assert normalize_text("  Bad\tday  :D ") == "Bad day :D"
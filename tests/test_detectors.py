@@ -0,0 +1,41 @@
+import time
+
+from moodmusic import detectors
+from moodmusic.detectors import FaceDetector
+
+
+def fake_detect(latencies):
+    calls = []
+
+    def detect_face(backend, image, gray):
+        calls.append(backend)
+        time.sleep(latencies[backend].pop(0) if latencies.get(backend) else 0.0)
+        return (0, 0, 10, 10)
+
+    return detect_face, calls
+
+
+def test_cold_first_call_does_not_trigger_fallback(monkeypatch):
+    detect_face, _ = fake_detect({"yunet": [0.2]})
+    monkeypatch.setattr(detectors, "detect_face", detect_face)
+    detector = FaceDetector("yunet", latency_budget_ms=50)
+
+    for _ in range(5):
+        detector.detect(None, None)
+
+    assert detector.backend == "yunet"
+
+
+def test_slow_backend_falls_back_and_is_retried_after_cool_down(monkeypatch):
+    detect_face, calls = fake_detect({"yunet": [0.0, 0.2]})
+    monkeypatch.setattr(detectors, "detect_face", detect_face)
+    detector = FaceDetector("yunet", latency_budget_ms=50, retry_after_s=0.1)
+
+    detector.detect(None, None)
+    detector.detect(None, None)
+    assert detector.backend == "opencv"
+
+    time.sleep(0.15)
+    detector.detect(None, None)
+    assert calls[-1] == "yunet"
+    assert detector.backend == "yunet"
@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+
+from moodmusic.index import TrackIndex
+from moodmusic.moods import DEFAULT_GENRE, genre_for_mood
+from moodmusic.scoring import rank
+
+CATALOG = os.path.join(os.path.dirname(__file__), os.pardir, "fixtures", "catalog.json")
+
+
+def test_from_catalog_file():
+    index = TrackIndex.from_catalog_file(CATALOG)
+
+    assert len(index) == 105
+    assert len(index.genres) == 7
+
+
+def test_save_load_round_trip(tmp_path):
+    index = TrackIndex.from_catalog_file(CATALOG)
+    path = tmp_path / "index.npz"
+    index.save(str(path))
+    loaded = TrackIndex.load(str(path))
+
+    assert loaded.genres == index.genres
+    np.testing.assert_array_equal(loaded.track_id, index.track_id)
+    np.testing.assert_array_equal(loaded.track_valence, index.track_valence)
+    assert loaded.recommend("Happy") == index.recommend("Happy")
+
+
+def test_recommend():
+    index = TrackIndex.from_catalog_file(CATALOG)
+    genre, playlists = index.recommend("Happy", limit=3, track_limit=2)
+
+    assert genre == genre_for_mood("Happy")
+    assert len(playlists) == 3
+    for playlist, tracks in playlists:
+        assert playlist["id"]
+        assert 0 < len(tracks["items"]) <= 2
+
+
+def _catalog(playlists):
+    """A catalog with one "pop" search; ``playlists`` maps id → [(valence, energy), ...]."""
+    searches = {"pop": {"playlists": {"items": [
+        {"id": playlist_id, "name": playlist_id} for playlist_id in playlists
+    ]}}}
+    tracks, features = {}, {}
+    for playlist_id, points in playlists.items():
+        items = []
+        for n, (valence, energy) in enumerate(points):
+            track_id = f"{playlist_id}-{n}"
+            items.append({"track": {"id": track_id, "name": track_id, "artists": []}})
+            features[track_id] = {"valence": valence, "energy": energy}
+        tracks[playlist_id] = {"items": items}
+    return {"searches": searches, "tracks": tracks, "features": features}
+
+
+def test_rank_nearest_first():
+    index = TrackIndex.from_catalog_file(CATALOG)
+    point = np.array([0.8, 0.7], dtype=np.float32)
+
+    order = rank(index.track_valence, index.track_energy, point, 10)
+
+    distances = (index.track_valence - point[0]) ** 2 + (index.track_energy - point[1]) ** 2
+    np.testing.assert_allclose(distances[order], np.sort(distances)[:10])
+    assert len(rank(index.track_valence, index.track_energy, point, 0)) == 0
+
+
+def test_recommend_point_caps_playlists_and_tracks():
+    index = TrackIndex.from_catalog_file(CATALOG)
+    point = np.array([0.8, 0.7], dtype=np.float32)
+
+    genre, playlists = index.recommend_point(point, limit=2, track_limit=2)
+
+    assert len(playlists) == 2
+    assert all(0 < len(tracks["items"]) <= 2 for _, tracks in playlists)
+    nearest = index.track_id[rank(index.track_valence, index.track_energy, point, 1)[0]]
+    assert playlists[0][1]["items"][0]["track"]["id"] == nearest
+    assert genre in index.genres
+
+
+def test_recommend_point_reranks_when_candidates_bunch():
+    index = TrackIndex.from_catalog(_catalog({
+        "near": [(0.5, 0.5)] * 30,
+        "mid": [(0.6, 0.6)],
+        "far": [(0.9, 0.9)],
+    }))
+
+    _, playlists = index.recommend_point((0.5, 0.5), limit=3, track_limit=1)
+
+    assert [playlist["id"] for playlist, _ in playlists] == ["near", "mid", "far"]
+
+
+def test_recommend_point_edge_cases():
+    index = TrackIndex.from_catalog_file(CATALOG)
+    assert index.recommend_point((0.5, 0.5), limit=0) == (DEFAULT_GENRE, [])
+
+    empty = TrackIndex.from_catalog({"searches": {}, "tracks": {}})
+    assert empty.recommend_point((0.5, 0.5)) == (DEFAULT_GENRE, [])
@@ -0,0 +1,55 @@
+import os
+
+from moodmusic.media import DiskLRU
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = DiskLRU(str(tmp_path), max_bytes=10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"  # "b" is now least recently used
+
+    cache.put("c", b"cccc")
+
+    assert "b" not in cache
+    assert not os.path.exists(tmp_path / "b")
+    assert cache.get("a") == b"aaaa"
+    assert cache.stats() == {"files": 2, "bytes": 8, "max_bytes": 10, "evictions": 1}
+
+
+def test_replacing_a_file_updates_its_size(tmp_path):
+    cache = DiskLRU(str(tmp_path), max_bytes=100)
+    cache.put("a", b"aaaa")
+    cache.put("a", b"aa")
+
+    assert cache.stats()["bytes"] == 2
+
+
+def test_missing_file_is_dropped_from_accounting(tmp_path):
+    cache = DiskLRU(str(tmp_path), max_bytes=100)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bb")
+    os.remove(tmp_path / "a")  # e.g. evicted by another worker
+
+    assert cache.get("a") is None
+    assert "a" not in cache
+    assert cache.stats()["bytes"] == 2
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 2
+
+
+def test_order_survives_restart(tmp_path):
+    cache = DiskLRU(str(tmp_path), max_bytes=10)
+    for name in ("a", "b"):
+        cache.put(name, b"xxxx")
+    # "b" was used longer ago than "a", despite being written later.
+    os.utime(tmp_path / "a", (2000, 2000))
+    os.utime(tmp_path / "b", (1000, 1000))
+    (tmp_path / "partial.123.tmp").write_bytes(b"x" * 50)
+
+    restarted = DiskLRU(str(tmp_path), max_bytes=10)
+    assert restarted.stats()["bytes"] == 8
+    restarted.put("c", b"cccc")
+
+    assert "b" not in restarted
+    assert "a" in restarted and "c" in restarted
@@ -0,0 +1,91 @@
+import threading
+import time
+
+import pytest
+import spotipy
+
+from moodmusic.scheduler import BACKGROUND, INTERACTIVE, SpotifyScheduler
+from moodmusic.spotify import get_spotify_client
+
+
+@pytest.fixture
+def sp(fake):
+    return get_spotify_client("test-id", "test-secret", api_base=fake.url)
+
+
+def search(sp):
+    return sp.search(q="playlist pop", type="playlist", limit=3)
+
+
+def test_interactive_call_fails_fast_on_long_retry_after(fake, sp):
+    fake.rate_429 = 1.0
+    fake.retry_after = 30
+    scheduler = SpotifyScheduler(base_backoff=0.01)
+
+    started = time.monotonic()
+    with pytest.raises(spotipy.SpotifyException) as error:
+        scheduler.call("search", lambda: search(sp), timeout=1.0)
+
+    assert error.value.http_status == 429
+    assert time.monotonic() - started < 1.0
+    assert scheduler.metrics()["throttled"] == 1
+    assert scheduler.metrics()["paused_for"] > 20
+
+    # While paused, later interactive calls do not even queue.
+    with pytest.raises(TimeoutError):
+        scheduler.call("search", lambda: search(sp), timeout=1.0)
+    assert fake.requests == 1
+
+
+def test_retries_after_429_with_backoff(fake, sp):
+    fake.rate_429 = 1.0
+    fake.retry_after = 0
+    scheduler = SpotifyScheduler(base_backoff=0.01)
+
+    def flaky():
+        try:
+            return search(sp)
+        finally:
+            fake.rate_429 = 0.0
+
+    results = scheduler.call("search", flaky, timeout=5.0)
+
+    assert results["playlists"]["items"]
+    assert fake.requests == 2
+    assert scheduler.metrics()["retries"] == 1
+
+
+def test_background_call_waits_out_retry_after(fake, sp):
+    fake.rate_429 = 1.0
+    fake.retry_after = 1
+    scheduler = SpotifyScheduler(base_backoff=0.01)
+
+    def flaky():
+        try:
+            return search(sp)
+        finally:
+            fake.rate_429 = 0.0
+
+    started = time.monotonic()
+    results = scheduler.call("search", flaky, priority=BACKGROUND)
+
+    assert results["playlists"]["items"]
+    assert time.monotonic() - started >= 1.0
+
+
+def test_interactive_calls_run_before_background(sp):
+    scheduler = SpotifyScheduler(workers=1)
+    release = threading.Event()
+    order = []
+
+    blocker = scheduler.submit("blocker", release.wait)
+    queued = [
+        scheduler.submit("background", lambda: order.append("background") or search(sp), BACKGROUND),
+        scheduler.submit("interactive", lambda: order.append("interactive") or search(sp), INTERACTIVE),
+    ]
+    release.set()
+    blocker.result(timeout=5)
+    for future in queued:
+        future.result(timeout=5)
+
+    assert order == ["interactive", "background"]
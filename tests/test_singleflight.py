@@ -0,0 +1,97 @@
+import threading
+import time
+
+import pytest
+
+from moodmusic.singleflight import SingleFlight
+
+
+def run_concurrently(flight, key, fn, n):
+    results, errors = [], []
+
+    def call():
+        try:
+            results.append(flight.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=5)
+    return results, errors
+
+
+def blocking(release, result=None, error=None):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        release.wait(timeout=5)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, calls
+
+
+def start_when_all_waiting(flight, n, release):
+    # Let the followers join the in-flight call before the leader finishes.
+    def release_later():
+        while flight.stats()["shared"] < n - 1:
+            time.sleep(0.001)
+        release.set()
+
+    threading.Thread(target=release_later, daemon=True).start()
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    release = threading.Event()
+    fn, calls = blocking(release, result="playlists")
+    start_when_all_waiting(flight, 10, release)
+
+    results, errors = run_concurrently(flight, "pop", fn, 10)
+
+    assert calls == [1]
+    assert results == ["playlists"] * 10
+    assert errors == []
+    assert flight.stats()["calls"] == 1
+    assert flight.stats()["shared"] == 9
+
+
+def test_leader_exception_reaches_every_follower():
+    flight = SingleFlight()
+    release = threading.Event()
+    error = RuntimeError("Spotify down")
+    fn, calls = blocking(release, error=error)
+    start_when_all_waiting(flight, 5, release)
+
+    results, errors = run_concurrently(flight, "pop", fn, 5)
+
+    assert calls == [1]
+    assert results == []
+    assert errors == [error] * 5
+
+
+def test_next_call_after_completion_runs_again():
+    flight = SingleFlight()
+    calls = []
+
+    assert flight.do("pop", lambda: calls.append(1) or len(calls)) == 1
+    assert flight.do("pop", lambda: calls.append(1) or len(calls)) == 2
+    with pytest.raises(KeyError):
+        flight.do("pop", lambda: {}["missing"])
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_per_key_counts_are_bounded():
+    flight = SingleFlight(max_tracked_keys=3)
+
+    for i in range(10):
+        flight.do(("tracks", i), lambda: None)
+
+    assert flight.stats()["calls"] == 10
+    assert len(flight._keys) == 3
+    assert list(flight._keys) == [("tracks", 7), ("tracks", 8), ("tracks", 9)]